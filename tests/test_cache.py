@@ -0,0 +1,85 @@
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+
+from visualplot.blocks.image_like import Imshow
+from visualplot.cache import RenderCache
+from visualplot.visualization import Visualization
+
+
+def save(tmp_path, cache, data, setup=None, **kwargs):
+    fig, ax = plt.subplots(figsize=(2, 2))
+    block = Imshow(data, ax=ax)
+    if setup is not None:
+        setup(block, ax, fig)
+    v = Visualization([block], fig=fig)
+    progress = []
+    v.save(str(tmp_path / 'out.gif'), 'pillow', cache=cache,
+           progress_callback=lambda i, n: progress.append(i), **kwargs)
+    plt.close(fig)
+    return progress
+
+
+def test_positional_writer_and_progress(tmp_path):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    progress = save(tmp_path, cache, np.random.rand(5, 4, 4))
+    assert len(progress) == 5
+    assert len(cache) == 5
+
+
+def test_hits_and_misses(tmp_path):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    data = np.random.rand(5, 4, 4)
+    save(tmp_path, cache, data)
+    save(tmp_path, cache, data)
+    assert len(cache) == 5
+    save(tmp_path, cache, data, lambda b, ax, fig: b.im.set_clim(0, 10))
+    assert len(cache) == 10
+    save(tmp_path, cache, data, lambda b, ax, fig: ax.set_title('other'))
+    assert len(cache) == 15
+
+
+def test_extra_anim_is_refused(tmp_path):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    with pytest.raises(ValueError):
+        save(tmp_path, cache, np.random.rand(2, 4, 4), extra_anim=[object()])
+
+
+def test_key_colormaps_and_norms():
+    from matplotlib.colors import LogNorm
+
+    viridis = plt.get_cmap('viridis')
+    assert RenderCache.key(viridis) == RenderCache.key(viridis.copy())
+    assert RenderCache.key(viridis) != RenderCache.key(plt.get_cmap('gray'))
+    assert (RenderCache.key(LogNorm(1, 10)) ==
+            RenderCache.key(LogNorm(1, 10)))
+    assert (RenderCache.key(LogNorm(1, 10)) !=
+            RenderCache.key(LogNorm(1, 100)))
+    with pytest.raises(TypeError):
+        RenderCache.key(object())
+
+
+def test_unhashable_inputs_are_drawn(tmp_path):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    fig, ax = plt.subplots(figsize=(2, 2))
+    block = Imshow(np.random.rand(3, 4, 4), ax=ax, transform=ax.transData)
+    Visualization([block], fig=fig).save(str(tmp_path / 'out.gif'),
+                                         'pillow', cache=cache)
+    assert len(cache) == 0
+
+
+def test_entries_are_compressed(tmp_path):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    frame = bytes(1920 * 1080 * 4)
+    cache.put('a', frame)
+    assert cache.get('a') == frame
+    assert 'a' in cache
+    assert cache._size < len(frame) // 100
+
+
+def test_eviction(tmp_path):
+    cache = RenderCache(str(tmp_path / 'cache'), max_bytes=2500)
+    for i in range(5):
+        cache.put(str(i), np.random.bytes(1000))
+    assert len(cache) == 2
+    assert cache.get('4') is not None
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from visualplot.framestore import FrameStore
+from visualplot.limits import frame_limits
+
+
+@pytest.mark.parametrize('compression', [None, 'zlib', 'lzma'])
+def test_round_trip(compression):
+    data = np.random.rand(10, 4, 5)
+    store = FrameStore(data, compression=compression, chunksize=3)
+    assert store.shape == data.shape
+    np.testing.assert_allclose(np.asarray(store), data, atol=1 / 250)
+
+
+def test_nan_frames():
+    data = np.random.rand(4, 3, 3)
+    data[1] = np.nan
+    data[2, 0, 0] = np.nan
+    store = FrameStore(data, dtype=np.uint16)
+    assert np.isnan(store[1]).all()
+    assert np.isnan(store[2][0, 0])
+
+
+def test_integer_frames_are_exact():
+    rgb = np.random.randint(0, 256, (5, 4, 4, 3), dtype=np.uint8)
+    store = FrameStore(rgb, compression='zlib')
+    assert store[2].dtype == np.uint8
+    np.testing.assert_array_equal(np.asarray(store), rgb)
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_threaded_reads(prefetch):
+    data = np.random.rand(200, 16, 16).astype(np.float32)
+    store = FrameStore(data, compression='zlib', chunksize=4,
+                       prefetch=prefetch)
+    limits = frame_limits(store, None, chunksize=8, workers=8)
+    np.testing.assert_allclose(limits, frame_limits(data), atol=0.01)
@@ -0,0 +1,46 @@
+import base64
+import re
+import zlib
+from io import BytesIO
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from visualplot.blocks.image_like import Imshow
+from visualplot.visualization import Visualization
+
+
+def decode_chunk(html, k, n_pixels):
+    text = re.search(rf'-chunk-{k}">([^<]*)<', html).group(1)
+    data = np.frombuffer(zlib.decompress(base64.b64decode(text)),
+                         dtype=np.uint8).reshape(-1, 4, n_pixels)
+    # undo the differences between frames
+    return np.cumsum(data, axis=0, dtype=np.uint8)
+
+
+def test_frames_and_controls(tmp_path):
+    fig, ax = plt.subplots(figsize=(2, 2))
+    block = Imshow(np.random.rand(7, 4, 4), ax=ax)
+    v = Visualization([block], fig=fig)
+    v.timeline_slider()
+    v.toggle()
+    v.timeline.index = 2
+    v._draw_frame(2)
+
+    html = v.to_html(str(tmp_path / 'player.html'), chunksize=3, dpi=20)
+    assert html.count('-chunk-') == 3 + 1  # the chunks, and the lookup
+    assert (tmp_path / 'player.html').read_text() == html
+
+    # the figure is left as it was
+    assert v.slider_ax.get_visible() and v.button_ax.get_visible()
+    np.testing.assert_array_equal(block.im.get_array(), block.ims[2])
+
+    v.slider_ax.set_visible(False)
+    v.button_ax.set_visible(False)
+    frames = decode_chunk(html, 1, 40 * 40)
+    for j, frame in enumerate(frames):
+        v._draw_frame(3 + j)
+        buf = BytesIO()
+        fig.savefig(buf, format='rgba', dpi=20)
+        expected = np.frombuffer(buf.getvalue(), dtype=np.uint8)
+        np.testing.assert_array_equal(frame.T.ravel(), expected)
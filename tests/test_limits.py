@@ -0,0 +1,43 @@
+import warnings
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from visualplot.blocks.image_like import Imshow
+from visualplot.blocks.lineplots import Line
+from visualplot.limits import compute_limits, frame_limits
+
+
+def test_frame_limits():
+    data = np.random.rand(10, 3, 3)
+    data[4] = np.nan
+    limits = frame_limits(data, chunksize=3, workers=2)
+    assert limits.shape == (10, 2)
+    assert np.isnan(limits[4]).all()
+    np.testing.assert_allclose(limits[0], [data[0].min(), data[0].max()])
+
+
+def test_rolling_limits():
+    data = np.arange(10.)[:, None] * np.ones((10, 4))
+    limits = compute_limits(data, window=3)
+    np.testing.assert_allclose(limits[5], [4, 6])
+    np.testing.assert_allclose(limits[0], [0, 1])
+    np.testing.assert_allclose(compute_limits(data), [0, 9])
+
+
+def test_autoscale_image():
+    fig, ax = plt.subplots()
+    data = np.random.rand(5, 4, 4)
+    data[3] *= 10
+    block = Imshow(data, ax=ax).autoscale()
+    assert block.im.get_clim() == (data.min(), data.max())
+
+
+def test_autoscale_flat_line():
+    fig, ax = plt.subplots()
+    x = np.broadcast_to(np.arange(5.), (4, 5))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        Line(x, np.ones((4, 5)), ax=ax).autoscale(window=2)
+    lo, hi = ax.get_ylim()
+    assert lo < 1 < hi
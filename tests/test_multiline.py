@@ -0,0 +1,55 @@
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+
+from visualplot.blocks.lineplots import MultiLine
+from visualplot.thumbnails import frame_changes
+from visualplot.visualization import Visualization
+
+
+def make_y(T=6, L=3, N=5):
+    return np.random.rand(T, L, N)
+
+
+def test_rectangular():
+    fig, ax = plt.subplots()
+    y = make_y()
+    block = MultiLine(np.arange(5), y, ax=ax)
+    assert len(block) == 6
+    block._update(4)
+    np.testing.assert_array_equal(block.lines.get_segments()[1][:, 1],
+                                  y[4, 1])
+
+
+def test_time_axis():
+    fig, ax = plt.subplots()
+    y = make_y()
+    block = MultiLine(np.moveaxis(y, 0, 2), ax=ax, t_axis=2)
+    assert len(block) == 6
+
+
+def test_ragged():
+    fig, ax = plt.subplots()
+    x = [[np.arange(3), np.arange(4)], [np.arange(2)]]
+    y = [[np.ones(3), np.ones(4)], [np.zeros(2)]]
+    block = MultiLine(x, y, ax=ax)
+    block._update(1)
+    assert len(block.lines.get_segments()) == 1
+
+
+@pytest.mark.parametrize('alpha', [0.5, np.full(3, 0.5),
+                                   np.full((6, 3), 0.5)])
+def test_alpha(alpha):
+    fig, ax = plt.subplots()
+    block = MultiLine(make_y(), alpha=alpha, ax=ax)
+    block._update(2)
+    fig.canvas.draw()
+
+
+def test_animated_colors_change():
+    fig, ax = plt.subplots()
+    colors = np.zeros((6, 3, 3))
+    colors[3:] = 1
+    block = MultiLine(np.ones((6, 3, 5)), colors=colors, ax=ax)
+    changes = frame_changes(Visualization([block], fig=fig))
+    np.testing.assert_array_equal(changes > 0, np.arange(6) == 3)
@@ -0,0 +1,61 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from visualplot.blocks.lineplots import Line, Scatter
+from visualplot.picking import PointIndex
+
+
+def _brute_force(x, y, qx, qy, radius=np.inf):
+    dist = np.hypot(x - qx, y - qy)
+    dist[~np.isfinite(dist)] = np.inf
+    k = np.argmin(dist)
+    return int(k) if dist[k] <= radius else None
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(0)
+    x, y = rng.random(5000), rng.random(5000)
+    index = PointIndex(x, y)
+    for qx, qy in rng.uniform(-0.5, 1.5, (100, 2)):
+        assert index.nearest(qx, qy) == _brute_force(x, y, qx, qy)
+
+
+def test_clustered_points():
+    rng = np.random.default_rng(1)
+    # a tight cluster and one far away outlier
+    x = np.append(rng.random(20000) * 1e-4, 1.)
+    y = np.append(rng.random(20000) * 1e-4, 1.)
+    index = PointIndex(x, y)
+    assert index.nearest(0.9, 0.9) == 20000
+    for qx, qy in rng.random((50, 2)):
+        assert index.nearest(qx, qy) == _brute_force(x, y, qx, qy)
+
+
+def test_radius_and_scale():
+    index = PointIndex([0., 10.], [0., 0.])
+    assert index.nearest(4., 0., radius=3) is None
+    assert index.nearest(4., 0., radius=4) == 0
+    # stretching y moves the point at 10 out of the radius
+    assert index.nearest(9., 5., radius=6, scale=(1., 1.)) == 1
+    assert index.nearest(9., 5., radius=6, scale=(1., 2.)) is None
+
+
+def test_non_finite_and_empty():
+    x = np.array([np.nan, 1., np.inf, 3.])
+    y = np.array([0., 0., 0., np.nan])
+    index = PointIndex(x, y)
+    assert len(index) == 1
+    assert index.nearest(10., 10.) == 1
+    assert PointIndex([], []).nearest(0., 0.) is None
+
+
+def test_block_pick():
+    fig, ax = plt.subplots()
+    x = np.linspace(0, 1, 50)
+    y = np.vstack([x, 1 - x])
+    scatter = Scatter(np.vstack([x, x]), y, ax=ax)
+    line = Line(x, y, ax=ax)
+    fig.canvas.draw()
+    assert scatter.pick(x[10], x[10]) == 10
+    assert line.pick(x[40], x[40]) == 40
+    assert scatter.pick(0., 1., radius=1) is None
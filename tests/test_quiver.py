@@ -0,0 +1,47 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from visualplot.blocks.vectors import Quiver
+
+
+def _grid(n=20, frames=3):
+    x = np.linspace(0, 10, n)
+    X, Y = np.meshgrid(x, x)
+    U = np.ones((frames, n, n))
+    V = np.zeros((frames, n, n))
+    return X, Y, U, V
+
+
+def test_min_length_with_xy_scale_units():
+    fig, ax = plt.subplots()
+    X, Y, U, V = _grid()
+    U[:, :, :10] = 0.01
+    block = Quiver(X, Y, U, V, ax=ax, min_length=2, scale_units='xy',
+                   scale=1)
+    ax.set_xlim(0, 10)
+    pixels = block._pixels_per_unit()
+    assert pixels is not None
+    np.testing.assert_allclose(pixels[0], ax.bbox.width / 10)
+
+    u, v = block._frame_uv(1)
+    assert np.ma.getmaskarray(u)[:, :10].all()
+    assert not np.ma.getmaskarray(u)[:, 10:].any()
+
+
+def test_rethin_keeps_properties():
+    fig, ax = plt.subplots()
+    X, Y, U, V = _grid(100)
+    block = Quiver(X, Y, U, V, ax=ax, density=20)
+    fig.canvas.draw()
+    block.Q.set_color('red')
+    block.Q.set_alpha(0.5)
+    block.Q.set_zorder(5)
+    original = block.Q
+
+    ax.set_xlim(0, 2)
+    assert block.Q is not original
+    np.testing.assert_allclose(block.Q.get_facecolor(), [[1, 0, 0, 0.5]])
+    assert block.Q.get_alpha() == 0.5
+    assert block.Q.get_zorder() == 5
+    assert block.Q in ax.collections
+    fig.canvas.draw()
@@ -0,0 +1,44 @@
+import matplotlib.pyplot as plt
+
+from visualplot.blocks.update import Retained
+
+
+def _points(i):
+    # frame i shows i + 1 points
+    return [{'xdata': [k], 'ydata': [i]} for k in range(i + 1)]
+
+
+def test_artists_are_reused():
+    fig, ax = plt.subplots()
+    block = Retained(_points, 4, lambda ax: ax.plot([], [], 'o')[0], ax=ax)
+    assert len(block.artists) == 1
+
+    block._update(3)
+    artists = list(block.artists)
+    assert len(artists) == 4
+    block._update(1)
+    assert block.artists == artists
+    assert [a.get_visible() for a in artists] == [True, True, False, False]
+    assert list(artists[1].get_xdata()) == [1]
+    assert len(ax.lines) == 4
+
+
+def test_max_idle():
+    fig, ax = plt.subplots()
+    block = Retained(_points, 4, lambda ax: ax.plot([], [])[0], max_idle=1,
+                     ax=ax)
+    block._update(3)
+    block._update(0)
+    assert len(block.artists) == 2
+    assert len(ax.lines) == 2
+    assert not block.artists[1].get_visible()
+
+
+def test_apply():
+    fig, ax = plt.subplots()
+    block = Retained(lambda i: [i], 2, lambda ax: ax.text(0, 0, ''),
+                     apply=lambda artist, item: artist.set_text(str(item)),
+                     ax=ax)
+    block._update(1)
+    assert block.artists[0].get_text() == '1'
+    assert len(block) == 2
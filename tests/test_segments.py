@@ -0,0 +1,71 @@
+import time
+
+from visualplot.segments import Manifest
+
+
+def test_segments(tmp_path):
+    manifest = Manifest(str(tmp_path), 25, 10, '.mp4')
+    assert manifest.segments() == [(0, 10), (10, 20), (20, 25)]
+    assert manifest.segments(5, 25) == [(10, 20), (20, 25)]
+
+
+def test_claims(tmp_path):
+    manifest = Manifest(str(tmp_path), 20, 10, '.mp4')
+    other = Manifest.load(str(tmp_path))
+    # a live process's claim is not taken by another
+    other.owner = dict(other.owner, pid=other.owner['pid'] + 1)
+    assert manifest.claim((0, 10))
+    manifest._alive = lambda claim: True
+    assert not other.claim((0, 10))
+
+    manifest.release((0, 10))
+    assert other.claim((0, 10))
+    other.release((0, 10))
+
+    open(manifest.path(0), 'w').close()
+    assert manifest.claim((0, 10))
+    manifest.complete((0, 10))
+    assert manifest.completed() == [(0, 10)]
+    assert manifest.missing() == [(10, 20)]
+    assert not other.claim((0, 10))
+
+
+def test_stale_claim(tmp_path):
+    manifest = Manifest(str(tmp_path), 20, 10, '.mp4')
+    other = Manifest.load(str(tmp_path))
+    other.owner = dict(other.owner, host='elsewhere')
+    assert manifest.claim((0, 10))
+    assert not other.claim((0, 10))
+    other.stale_claim = 0
+    time.sleep(0.01)
+    assert other.claim((0, 10))
+    other.release((0, 10))
+    manifest.release((0, 10))
+
+
+def test_renewal_stops(tmp_path):
+    manifest = Manifest(str(tmp_path), 20, 10, '.mp4')
+    assert manifest.claim((0, 10))
+    assert manifest.claim((10, 20))
+    renewals = list(manifest._renewals.values())
+    manifest.release((0, 10))
+    manifest.complete((10, 20))
+    for renewal in renewals:
+        renewal.join(1)
+        assert not renewal.is_alive()
+    assert not manifest._renewals
+
+
+def test_renewal_keeps_claim(tmp_path):
+    manifest = Manifest(str(tmp_path), 10, 10, '.mp4')
+    manifest.stale_claim = 0.3
+    assert manifest.claim((0, 10))
+    claimed = manifest._read()['claimed']['0']['time']
+    time.sleep(0.25)
+    assert manifest._read()['claimed']['0']['time'] > claimed
+    manifest.release((0, 10))
+
+
+def test_path_without_extension(tmp_path):
+    manifest = Manifest(str(tmp_path), 10, 10, '')
+    assert manifest.path(0).endswith('segment_00000000')
@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+
+from visualplot.blocks.image_like import Imshow
+from visualplot.blocks.update import Update
+from visualplot.cache import RenderCache, _CachedFigure
+from visualplot.thumbnails import select_keyframes
+from visualplot.visualization import Visualization
+
+
+def make_visualization(length=20):
+    fig, ax = plt.subplots(figsize=(2, 1.5))
+    block = Imshow(np.random.rand(length, 4, 4), ax=ax)
+    return Visualization([block], fig=fig), block
+
+
+def test_render_arrays():
+    v, _ = make_visualization()
+    frames = v.render_frames([0, 5], size=(3, 2), dpi=20)
+    assert [frame.shape for frame in frames] == [(40, 60, 4)] * 2
+    np.testing.assert_array_equal(v.fig.get_size_inches(), [2, 1.5])
+
+
+@pytest.mark.parametrize('format', ['png', 'webp', 'jpg', 'jpeg'])
+def test_render_files(tmp_path, format):
+    v, _ = make_visualization()
+    paths = v.render_frames([2], directory=str(tmp_path), format=format,
+                            dpi=20)
+    assert paths == [str(tmp_path / f'frame_00000002.{format}')]
+    assert os.path.getsize(paths[0])
+
+
+def test_cached_jpg(tmp_path):
+    v, _ = make_visualization(2)
+    fig = _CachedFigure(v.fig, RenderCache(str(tmp_path)), v._draw_frame)
+    with open(tmp_path / 'frame.jpg', 'wb') as f:
+        fig.savefig(f, format='jpg', dpi=20)
+
+
+def test_parallel_matches_serial():
+    v, _ = make_visualization()
+    parallel = v.render_frames([3, 7], dpi=20, workers=2)
+    serial = v.render_frames([3, 7], dpi=20, workers=1)
+    for a, b in zip(parallel, serial):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_restores_frame():
+    v, block = make_visualization()
+    v._draw_frame(4)
+    v.timeline.index = 4
+    v.render_frames([1, 15], workers=1, dpi=20)
+    np.testing.assert_array_equal(block.im.get_array(), block.ims[4])
+
+
+def test_keyframes_from_pixels():
+    fig, ax = plt.subplots(figsize=(1, 1))
+    im = ax.imshow(np.zeros((4, 4)), vmin=0, vmax=1)
+    data = np.zeros((10, 4, 4))
+    data[5:] = 1
+    v = Visualization([Update(lambda i: im.set_data(data[i]), 10)], fig=fig)
+    assert 5 in v.keyframes(1, workers=1) + v.keyframes(3, workers=1)
+
+
+def test_select_keyframes():
+    assert select_keyframes(np.zeros(10), 4) == [1, 3, 6, 8]
+    assert len(select_keyframes(np.r_[0, 0, 100, 0, 0, 0], 4)) == 4
+    assert select_keyframes(np.ones(3), 10) == [0, 1, 2]
+
+
+def test_keyframes_cover_the_animation():
+    changes = np.zeros(40)
+    changes[20] = 1
+    frames = select_keyframes(changes, 3)
+    assert 20 in frames
+    assert min(np.diff(frames)) >= 40 // 6
+    assert frames[0] < 20 < frames[-1]
@@ -0,0 +1,54 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from utils import demeshgrid
+from visualplot.blocks.image_like import Imshow
+from visualplot.timeline import Timeline
+from visualplot.visualization import Visualization
+
+
+def test_range():
+    timeline = Timeline(range(5, 25, 2))
+    assert len(timeline) == 10
+    assert timeline[1] == 7
+    assert timeline[-1] == 23
+    np.testing.assert_array_equal(timeline.t, np.arange(5, 25, 2))
+
+
+def test_from_steps():
+    timeline = Timeline.from_steps(0.5, 0.25, 4)
+    assert len(timeline) == 4
+    assert timeline[3] == 1.25
+    np.testing.assert_allclose(timeline.t, [0.5, 0.75, 1., 1.25])
+
+
+def test_from_steps_datetime():
+    start = np.datetime64('2020-01-01')
+    timeline = Timeline.from_steps(start, np.timedelta64(1, 'D'), 3)
+    assert np.issubdtype(timeline.dtype, np.datetime64)
+    assert timeline[2] == np.datetime64('2020-01-03')
+
+
+def test_log():
+    timeline = Timeline.from_steps(1., 9., 3, log=True)
+    assert timeline.dtype == np.dtype(float)
+    assert timeline[1] == 1.
+    np.testing.assert_allclose(timeline.t, [0, 1, np.log10(19)])
+
+
+def test_demeshgrid():
+    t = np.linspace(0, 1, 7)
+    _, _, T = np.meshgrid(np.arange(3), np.arange(4), t)
+    np.testing.assert_array_equal(demeshgrid(T), t)
+    # broadcast arrays are read along their one varying axis
+    broadcast = np.broadcast_to(t[:, None, None], (7, 1000, 1000))
+    np.testing.assert_array_equal(demeshgrid(broadcast), t)
+    assert len(Timeline(broadcast)) == 7
+
+
+def test_slider_shows_time():
+    fig, ax = plt.subplots()
+    block = Imshow(np.random.rand(3, 2, 2), ax=ax)
+    v = Visualization([block], Timeline.from_steps(10., 5., 3), fig=fig)
+    v.timeline_slider()
+    assert v.slider.valtext.get_text() == '10.00'
@@ -0,0 +1,22 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from visualplot.blocks.image_like import Imshow
+from visualplot.visualization import Visualization
+
+
+def test_draw_frame_draws_once(monkeypatch):
+    fig, ax = plt.subplots()
+    block = Imshow(np.random.rand(10, 4, 4), ax=ax)
+    v = Visualization([block], fig=fig)
+    v.timeline_slider()
+    v._pause = True
+
+    calls = []
+    monkeypatch.setattr(block, '_update', calls.append)
+    monkeypatch.setattr(fig.canvas, 'draw', lambda: calls.append('draw'))
+    for i in range(10):
+        v._draw_frame(i)
+    assert calls == list(range(10))
+    assert v.slider.val == 9
+    assert v.slider.valtext.get_text() == '9.00'
@@ -22,12 +22,26 @@ def parametric_line(x, y):
 def demeshgrid(arr):
     """
     Turn an ndarray created by meshgrid back to 1D array
+    Only a couple of lines of the array are read, so this is cheap even for
+    huge or memory-mapped arrays.
     :param arr: array of dimension > 1
         This array should have been created by a meshgrid.
     :return: 1D array
     """
+    # axes of length 1 carry no information
+    arr = arr.reshape([n for n in arr.shape if n != 1] or [1])
 
     dim = len(arr.shape)
+    if dim == 1:
+        return arr
+
+    # broadcast arrays only vary along the axes with a stride
+    varying = [i for i in range(dim) if arr.strides[i] != 0]
+    if len(varying) == 1:
+        index = [0] * dim
+        index[varying[0]] = slice(None)
+        return arr[tuple(index)]
+
     for i in range(dim):
         slice_1 = [0] * dim
         slice_2 = [1] * dim
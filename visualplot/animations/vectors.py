@@ -24,10 +24,11 @@ def vector_plot(X, Y, U, V, t, skip=5, *, t_axis=0, units='', fps=10,
         The y components of the vectors to be animated.
     :param t : 1D numpy array
         The time values
-    :param skip : int, optional
+    :param skip : int or None, optional
         The amount of values to skip over when making the quiver plot.
         Higher skip means fewer arrows. For best results, the skip should
-        divide the length of the data-1. Defaults to 5.
+        divide the length of the data-1. Defaults to 5. If None, the
+        arrows are thinned to suit the size of the axes and the view.
     :param t_axis : int, optional
         The axis of the U, V array's the represent time. Defaults to 0. Note
         this is different from the defaults that blocks choose. This default
@@ -1,11 +1,24 @@
+from collections import OrderedDict
+
+import numpy as np
 from matplotlib import pyplot as plt
 
+from visualplot.limits import compute_limits
+from visualplot.picking import PointIndex
+
 
 class Block:
+    # the number of frames to keep spatial indexes of, for picking
+    pick_cache_size = 8
+
     def __init__(self, ax=None, t_axis=None):
         self.ax = ax if ax is not None else plt.gca()
         self.t_axis = t_axis
         self._is_list = False
+        self._limits = None
+        self._rolling = False
+        self._frame = 0
+        self._pick_indexes = OrderedDict()
 
     def _init(self):
         pass
@@ -16,6 +29,140 @@ class Block:
     def __len__(self):
         raise NotImplementedError()
 
+    def _frame_data(self, i):
+        """
+        The inputs that determine what frame ``i`` of this block looks like.
+        Used to recognise frames that are unchanged since a previous render.
+        Returns None if the frame can only be known by drawing it.
+        """
+        return None
+
+    def autoscale(self, window=None, percentile=None, chunksize=64,
+                  workers=None):
+        """
+        Set the limits of the block from every frame, rather than just the
+        first. Color limits are set for image-like blocks, and axis limits
+        for line and scatter blocks.
+        The data is read in a single chunked, parallel pass, see
+        :func:`visualplot.limits.compute_limits`, and the result is kept on
+        the block.
+
+        :param window: int, optional
+            If given, the limits follow the animation, covering the
+            ``window`` frames around the current one. Otherwise they are
+            fixed, covering the whole animation.
+        :param percentile: float or (float, float), optional
+            Use percentiles rather than the minimum and maximum, so outliers
+            do not stretch the limits. A single value p is taken as
+            (p, 100 - p). Percentiles are taken per frame.
+        :param chunksize: int, optional
+            The number of frames to read at a time. Defaults to 64.
+        :param workers: int, optional
+            The number of threads to use. Defaults to the number of CPUs.
+        :return: the block itself
+        """
+        self._limits = {}
+        for name, (data, t_axis) in self._limit_data().items():
+            self._limits[name] = compute_limits(
+                data, t_axis, window=window, percentile=percentile,
+                chunksize=chunksize, workers=workers)
+        self._rolling = window is not None
+        self._apply_limits(0)
+        return self
+
+    def _limit_data(self):
+        """
+        The data to find limits for: a dict mapping the name of the limit to
+        a tuple of the data and its time axis (None if indexed by frame).
+        """
+        raise NotImplementedError()
+
+    def _apply_limits(self, i):
+        for name, (lo, hi) in self._frame_limits(i).items():
+            if np.isfinite(lo) and np.isfinite(hi):
+                self._set_limits(name, lo, hi)
+
+    def _frame_limits(self, i):
+        """
+        The limits set by :meth:`autoscale` for frame ``i``, as a dict
+        mapping the name of the limit to a (lo, hi) pair. Empty if the
+        block has not been autoscaled.
+        """
+        if self._limits is None:
+            return {}
+        return {name: tuple(limits[i] if self._rolling else limits)
+                for name, limits in self._limits.items()}
+
+    def _set_limits(self, name, lo, hi):
+        axis = self.ax.xaxis if name == 'x' else self.ax.yaxis
+        # flat data would give an empty range
+        lo, hi = axis.get_major_locator().nonsingular(lo, hi)
+        margin = (hi - lo) * self.ax.margins()[name == 'y']
+        if name == 'x':
+            self.ax.set_xlim(lo - margin, hi + margin)
+        elif name == 'y':
+            self.ax.set_ylim(lo - margin, hi + margin)
+
+    def pick(self, x, y, radius=None):
+        """
+        Find the point of the displayed frame that is nearest to a position.
+        A spatial index of the frame's points is built the first time the
+        frame is picked from, and the indexes of recently picked frames are
+        kept, so that picking is fast enough to follow the mouse.
+
+        :param x: float
+            The x position, in data coordinates.
+        :param y: float
+            The y position, in data coordinates.
+        :param radius: float, optional
+            Only find points within this many pixels of the position.
+        :return: int or None
+            The index of the point within the frame, or None if there is no
+            point within the radius.
+        """
+        index = self._pick_index(self._frame)
+        # measure distances in pixels
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        scale = (self.ax.bbox.width / abs(x1 - x0),
+                 self.ax.bbox.height / abs(y1 - y0))
+        if radius is None:
+            radius = np.inf
+        return index.nearest(x, y, radius, scale)
+
+    def on_hover(self, func, radius=5):
+        """
+        Call a function with the point under the mouse as it moves over
+        the axes.
+
+        :param func: callable
+            Called as ``func(index, event)``, where index is as returned by
+            :meth:`pick`, and event is the matplotlib mouse event.
+        :param radius: float, optional
+            Only find points within this many pixels of the mouse.
+            Defaults to 5.
+        :return: int
+            The callback id, see
+            :meth:`matplotlib.backend_bases.FigureCanvasBase.mpl_disconnect`
+        """
+        def hover(event):
+            if event.inaxes is self.ax:
+                func(self.pick(event.xdata, event.ydata, radius), event)
+
+        return self.ax.figure.canvas.mpl_connect('motion_notify_event', hover)
+
+    def _pick_index(self, i):
+        if i in self._pick_indexes:
+            self._pick_indexes.move_to_end(i)
+        else:
+            self._pick_indexes[i] = PointIndex(*self._pick_points(i))
+            while len(self._pick_indexes) > self.pick_cache_size:
+                self._pick_indexes.popitem(last=False)
+        return self._pick_indexes[i]
+
+    def _pick_points(self, i):
+        """The x and y positions of the points of frame ``i``"""
+        raise NotImplementedError()
+
     def _make_slice(self, i, dim):
         if self._is_list:
             return i
@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 from visualplot.blocks.base import Block
+from visualplot.framestore import FrameStore
 
 
 class Pcolormesh(Block):
@@ -11,13 +12,13 @@ class Pcolormesh(Block):
         """
         :param X : 1D or 2D np.ndarray, optional
         :param Y : 1D or 2D np.ndarray, optional
-        :param C : list of 2D np.ndarray or a 3D np.ndarray
+        :param C : list of 2D np.ndarray, a 3D np.ndarray or a FrameStore
         :param ax : matplotlib.axes.Axes, optional
             The matplotlib axes to attach the block to.
             Defaults to matplotlib.pyplot.gca()
         :param t_axis : int, optional
             The axis of the array that represents time. Defaults to 0.
-            No effect if C is a list.
+            No effect if C is a list or a FrameStore.
 
         All other keyword arguments get passed to ``axis.pcolormesh``
         see :meth:`matplotlib.axes.Axes.pcolormesh` for details.
@@ -37,8 +38,9 @@ class Pcolormesh(Block):
 
         super().__init__(ax, t_axis)
 
-        self._is_list = isinstance(self.C, list)
-        self.C = np.asanyarray(self.C)
+        self._is_list = isinstance(self.C, (list, FrameStore))
+        if not isinstance(self.C, FrameStore):
+            self.C = np.asanyarray(self.C)
 
         slice_c = self._make_slice(0, 3)
 
@@ -57,6 +59,7 @@ class Pcolormesh(Block):
             # Need to slice without the workaround in _update()
             self.shading = "flat_corner_grid"
 
+        self._kwargs = kwargs
         if self._arg_len == 1:
             self.quad = self.ax.pcolormesh(self.C[slice_c], **kwargs)
         elif self._arg_len == 3:
@@ -69,6 +72,8 @@ class Pcolormesh(Block):
         else:
             slice_c = self._make_slice(i, 3)
             self.quad.set_array(self.C[slice_c])
+        if self._rolling:
+            self._apply_limits(i)
         return self.quad
 
     def __len__(self):
@@ -76,6 +81,17 @@ class Pcolormesh(Block):
             return self.C.shape[0]
         return self.C.shape[self.t_axis]
 
+    def _frame_data(self, i):
+        if self._arg_len == 3:
+            return self.X, self.Y, self.C[self._make_slice(i, 3)]
+        return self.C[self._make_slice(i, 3)]
+
+    def _limit_data(self):
+        return {'c': (self.C, None if self._is_list else self.t_axis)}
+
+    def _set_limits(self, name, lo, hi):
+        self.quad.set_clim(lo, hi)
+
     def _make_pcolormesh_flat_slice(self, i, dim):
         if self._is_list:
             return i
@@ -89,37 +105,53 @@ class Imshow(Block):
 
     def __init__(self, images, ax=None, t_axis=0, **kwargs):
         """
-        :param images: list of 2D/3D arrays, or a 3D or 4D array
+        :param images: list of 2D/3D arrays, a 3D or 4D array, or a FrameStore
             matplotlib considers arrays of the shape
             (n,m), (n,m,3), and (n,m,4) to be images.
             Images is either a list of arrays of those shapes,
             or an array of shape (T,n,m), (T,n,m,3), or (T,n,m,4)
             where T is the length of the time axis (assuming ``t_axis=0``).
+            A FrameStore of such images keeps them compressed in memory.
         :param ax: matplotlib.axes.Axes, optional
             The matplotlib axes to attach the block to.
             Defaults to matplotlib.gca()
         :param t_axis: int, optional
             The axis of the array that represents time. Defaults to 0.
-            No effect if images is a list
+            No effect if images is a list or a FrameStore
 
         This block accepts additional keyword arguments to be passed to
         :meth:`matplotlib.axes.Axes.imshow`
         """
-        self.ims = np.asanyarray(images)
+        if isinstance(images, FrameStore):
+            self.ims = images
+        else:
+            self.ims = np.asanyarray(images)
         super().__init__(ax, t_axis)
 
-        self._is_list = isinstance(images, list)
+        self._is_list = isinstance(images, (list, FrameStore))
         self._dim = len(self.ims.shape)
 
+        self._kwargs = kwargs
         slice_c = self._make_slice(0, self._dim)
         self.im = self.ax.imshow(self.ims[slice_c], **kwargs)
 
     def _update(self, i):
         slice_c = self._make_slice(i, self._dim)
         self.im.set_array(self.ims[slice_c])
+        if self._rolling:
+            self._apply_limits(i)
         return self.im
 
     def __len__(self):
         if self._is_list:
             return self.ims.shape[0]
         return self.ims.shape[self.t_axis]
+
+    def _frame_data(self, i):
+        return self.ims[self._make_slice(i, self._dim)]
+
+    def _limit_data(self):
+        return {'c': (self.ims, None if self._is_list else self.t_axis)}
+
+    def _set_limits(self, name, lo, hi):
+        self.im.set_clim(lo, hi)
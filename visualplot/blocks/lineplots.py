@@ -1,4 +1,6 @@
 import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
 
 from utils import parametric_line
 from visualplot.blocks.base import Block
@@ -10,9 +12,10 @@ class Line(Block):
     Accepts additional keyword arguments to be passed to
     :meth:`matplotlib.axes.Axes.plot`.
 
-    This block animates a single line - to animate multiple lines you must call
+    This block animates a single line - to animate multiple lines you can call
     this once for each line, and then animate all of the blocks returned by
-    passing a list of those blocks to `visualplot.Animation`.
+    passing a list of those blocks to `visualplot.Animation`. For more than a
+    handful of lines use `MultiLine`, which is much faster.
     """
 
     def __init__(self, *args, ax=None, t_axis=0, **kwargs):
@@ -101,6 +104,7 @@ class Line(Block):
         x_first_frame_data = self.x[frame_slice]
         y_first_frame_data = self.y[frame_slice]
 
+        self._kwargs = kwargs
         self.line, = self.ax.plot(x_first_frame_data,
                                   y_first_frame_data, **kwargs)
 
@@ -109,10 +113,197 @@ class Line(Block):
         x_vector = self.x[frame_slice]
         y_vector = self.y[frame_slice]
         self.line.set_data(x_vector, y_vector)
+        self._frame = frame
+        if self._rolling:
+            self._apply_limits(frame)
 
     def __len__(self):
         return self.y.shape[self.t_axis]
 
+    def _frame_data(self, i):
+        frame_slice = self._make_slice(i, dim=2)
+        return self.x[frame_slice], self.y[frame_slice]
+
+    def _limit_data(self):
+        t_axis = None if self._is_list else self.t_axis
+        return {'x': (self.x, t_axis), 'y': (self.y, t_axis)}
+
+    def _pick_points(self, i):
+        frame_slice = self._make_slice(i, dim=2)
+        return self.x[frame_slice], self.y[frame_slice]
+
+
+class MultiLine(Block):
+    """
+    Animates many lines at once.
+    All of the lines are drawn by a single
+    :class:`matplotlib.collections.LineCollection`, so the cost of a frame
+    barely depends on the number of lines. Use this rather than one `Line`
+    block per line for ensembles.
+    Accepts additional keyword arguments to be passed to
+    :class:`matplotlib.collections.LineCollection`.
+    """
+
+    def __init__(self, *args, colors=None, alpha=None, ax=None, t_axis=0,
+                 **kwargs):
+        """
+        :param x : 1D, 2D or 3D numpy array, or a ragged list, optional
+            The x data. A 1D array of length N is shared by every line, a 2D
+            array of shape (L, N) gives each line its own constant x, and an
+            array shaped like y is animated.
+            Required, and shaped like y, if y is ragged.
+        :param y : 3D numpy array, or list of lists of 1D numpy arrays
+            The y data to be animated. Either an array of shape (T, L, N)
+            holding L lines of N points for each of T frames (assuming
+            ``t_axis=0``), or a list with one entry per frame, each a list of
+            1D arrays, one per line. Ragged lines may differ in length, and
+            the number of lines may change between frames.
+        :param colors : color, list of colors or 3D numpy array, optional
+            The colors of the lines. A single color or one color per line
+            is constant over the animation. An array of shape (T, L, 3) or
+            (T, L, 4) animates the colors.
+        :param alpha : scalar, 1D or 2D numpy array, optional
+            The transparency of the lines. A scalar applies to every line,
+            an array of shape (L,) gives each line its own, and an array of
+            shape (T, L) animates it.
+            Animated colors and alpha need the same number of lines in every
+            frame.
+        :param ax : matplotlib.axes.Axes, optional
+            The matplotlib axes to attach the block to.
+            Defaults to matplotlib.pyplot.gca()
+        :param t_axis : int, optional
+            The axis of the y array that represents time. Defaults to 0.
+            The remaining axes are taken to be lines, then points.
+            No effect if y is a list.
+        :param **kwargs
+            Passed on to `matplotlib.collections.LineCollection`.
+        """
+        super().__init__(ax, t_axis)
+
+        if len(args) == 1:
+            y = args[0]
+            x = None
+        elif len(args) == 2:
+            [x, y] = args
+        else:
+            raise ValueError("Invalid data arguments to MultiLine block")
+
+        if isinstance(y, list):
+            # ragged data
+            if x is None:
+                raise ValueError("Must specify x data explicitly when passing"
+                                 " a ragged list for y data")
+            if len(x) != len(y):
+                raise ValueError("x & y must have the same number of frames")
+            for x_frame, y_frame in zip(x, y):
+                if (len(x_frame) != len(y_frame) or
+                        any(len(x_line) != len(y_line) for x_line, y_line
+                            in zip(x_frame, y_frame))):
+                    raise ValueError("Length of x & y data must match one "
+                                     "another for every line and frame")
+            self._is_list = True
+            self._segments = None
+        else:
+            y = np.moveaxis(np.asanyarray(y), t_axis, 0)
+            if y.ndim != 3:
+                raise ValueError("y data must be 3-dimensional")
+            _, n_lines, n_points = y.shape
+
+            if x is None:
+                x = np.arange(n_points)
+            x = np.asanyarray(x)
+            if x.ndim == 3:
+                x = np.moveaxis(x, t_axis, 0)
+                if x.shape != y.shape:
+                    raise ValueError("x must have the same shape as y when "
+                                     "animated")
+            elif x.shape not in [(n_points,), (n_lines, n_points)]:
+                raise ValueError("The dimensions of x must be compatible "
+                                 "with those of y, but the shape of x is {} "
+                                 "and the shape of y is {}"
+                                 .format(x.shape, y.shape))
+
+            # reused for every frame, so a frame is one vectorised copy
+            self._segments = np.empty((n_lines, n_points, 2))
+            if x.ndim < 3:
+                self._segments[..., 0] = x
+
+        self.x = x
+        self.y = y
+
+        if alpha is not None:
+            alpha = np.asanyarray(alpha)
+        self._colors_t = colors is not None and np.ndim(colors) == 3
+        self._alpha_t = alpha is not None and alpha.ndim == 2
+        self._rgba = None
+        if colors is not None and not self._colors_t:
+            kwargs['colors'] = colors
+        if alpha is not None and alpha.ndim == 0:
+            kwargs['alpha'] = float(alpha)
+        self._kwargs = kwargs
+
+        self.lines = LineCollection(self._frame_segments(0), **kwargs)
+        self.ax.add_collection(self.lines)
+        self.ax.autoscale_view()
+
+        if self._colors_t or (alpha is not None and alpha.ndim > 0):
+            if self._colors_t:
+                self.colors = np.asanyarray(colors)
+            else:
+                self.colors = self.lines.get_colors()
+            self.alpha = alpha
+            self._rgba = np.ones((0, 4))
+            self.lines.set_color(self._frame_colors(0))
+
+    def _frame_segments(self, i):
+        if self._is_list:
+            return [np.column_stack((x_line, y_line)) for x_line, y_line
+                    in zip(self.x[i], self.y[i])]
+        if self.x.ndim == 3:
+            self._segments[..., 0] = self.x[i]
+        self._segments[..., 1] = self.y[i]
+        return self._segments
+
+    def _frame_colors(self, i):
+        n_lines = len(self.y[i])
+        if len(self._rgba) != n_lines:
+            self._rgba = np.ones((n_lines, 4))
+        colors = self.colors[i] if self._colors_t else self.colors
+        self._rgba[:] = to_rgba_array(colors)
+        if self._alpha_t:
+            self._rgba[:, 3] = self.alpha[i]
+        elif self.alpha is not None:
+            self._rgba[:, 3] = self.alpha
+        return self._rgba
+
+    def _update(self, i):
+        self.lines.set_segments(self._frame_segments(i))
+        if self._colors_t or self._alpha_t:
+            self.lines.set_color(self._frame_colors(i))
+        if self._rolling:
+            self._apply_limits(i)
+        return self.lines
+
+    def __len__(self):
+        return len(self.y)
+
+    def _frame_data(self, i):
+        data = self.x[i] if self._is_list or self.x.ndim == 3 else self.x
+        # the color buffer is reused for every frame
+        colors = (self._frame_colors(i).copy() if self._rgba is not None
+                  else None)
+        return data, self.y[i], colors
+
+    def _limit_data(self):
+        if self._is_list:
+            return {'x': (_Flattened(self.x), None),
+                    'y': (_Flattened(self.y), None)}
+        x = self.x
+        if x.ndim < 3:
+            # constant over time, so broadcast without copying
+            x = np.broadcast_to(x, (len(self.y),) + x.shape)
+        return {'x': (x, 0), 'y': (self.y, 0)}
+
 
 class ParametricLine(Line):
     """Animates lines"""
@@ -164,6 +355,7 @@ class Scatter(Block):
         super().__init__(ax, t_axis)
 
         self._is_list = (self.x.dtype == 'object')
+        self._kwargs = kwargs
         c_slice = self._make_slice(0, 2)
         s_slice = self._make_s_slice(0, 2)
         self.scat = self.ax.scatter(self.x[c_slice], self.y[c_slice],
@@ -192,11 +384,42 @@ class Scatter(Block):
         data = np.vstack((x, y)).T
 
         self.scat.set_offsets(data)
+        self._frame = i
         if self._s_like_x:
             self.scat._sizes = self.s[s_slice]
+        if self._rolling:
+            self._apply_limits(i)
         return self.scat
 
     def __len__(self):
         if self._is_list:
             return self.x.shape[0]
         return self.x.shape[self.t_axis]
+
+    def _frame_data(self, i):
+        c_slice = self._make_slice(i, 2)
+        return (self.x[c_slice], self.y[c_slice],
+                self.s[self._make_s_slice(i, 2)], self.c)
+
+    def _limit_data(self):
+        t_axis = None if self._is_list else self.t_axis
+        return {'x': (self.x, t_axis), 'y': (self.y, t_axis)}
+
+    def _pick_points(self, i):
+        frame_slice = self._make_slice(i, dim=2)
+        return self.x[frame_slice], self.y[frame_slice]
+
+
+class _Flattened:
+    """Views a ragged list of frames of lines as one array per frame"""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def __getitem__(self, i):
+        if len(self.frames[i]) == 0:
+            return np.empty(0)
+        return np.concatenate([np.ravel(line) for line in self.frames[i]])
+
+    def __len__(self):
+        return len(self.frames)
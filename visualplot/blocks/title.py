@@ -82,3 +82,6 @@ class Title(Block):
 
     def __len__(self):
         return self._length
+
+    def _frame_data(self, i):
+        return self.titles[i], self._mpl_kwargs
@@ -8,7 +8,7 @@ class Update(Block):
     functionality not available with other blocks.
     """
 
-    def __int__(self, func, length, fargs=[], ax=None):
+    def __init__(self, func, length, fargs=[], ax=None):
         """
         :param func: callable
             This function will be called once for each frame of the animation.
@@ -47,8 +47,89 @@ class Nuke(Update):
     blocks are attached to a different axes.
     Only use this block as a last resort. Using the block
     is like nuking an ant hill. Hence the name.
+    Consider `Retained` first, which reuses artists between frames.
     """
 
     def _update(self, i):
         self.ax.clear()
         self.func(i, *self.fargs)
+
+
+class Retained(Block):
+    """
+    For providing custom data to a pool of reusable artists.
+    Rather than drawing each frame, the provided function returns the data
+    of every item to draw, and the block hands each item to an artist from
+    a pool. Artists are only created when a frame has more items than any
+    before it, and are hidden rather than removed when it has fewer, so the
+    axes are never cleared and its ticks, labels and limits are kept.
+    """
+
+    def __init__(self, func, length, create, apply=None, fargs=[],
+                 max_idle=None, ax=None):
+        """
+        :param func: callable
+            This function will be called once for each frame of the
+            animation. The first argument to this function must be an
+            integer representing the frame number. It should return a
+            sequence with one item for each artist to show on that frame.
+            The number of items may change from frame to frame.
+        :param length: int
+            The number of frames to display.
+        :param create: callable
+            Called with the axes whenever the pool needs another artist. It
+            should return an artist that has been added to the axes, e.g.
+            ``lambda ax: ax.plot([], [])[0]``.
+        :param apply: callable, optional
+            Called as ``apply(artist, item)`` to give an artist the data of
+            one item. Defaults to ``artist.set(**item)``, so that items can
+            be dicts of artist properties.
+        :param fargs: list, optional
+            A list of arguments to pass into func.
+        :param max_idle: int, optional
+            The number of unused artists to keep hidden for later frames.
+            Any more are removed from the axes. Defaults to keeping all.
+        :param ax: matplotlib.axes.Axes, optional
+            The matplotlib axes to which the block is attached.
+            Defaults to matplotlib.pyplot.gca()
+        """
+        self.func = func
+        self.length = length
+        self.create = create
+        self.apply = apply if apply is not None else _set_properties
+        self.fargs = fargs
+        self.max_idle = max_idle
+        super().__init__(ax)
+
+        self.artists = []
+        self._update(0)
+
+    def _update(self, i):
+        items = self.func(i, *self.fargs)
+        n_items = len(items)
+
+        while len(self.artists) < n_items:
+            self.artists.append(self.create(self.ax))
+
+        for artist, item in zip(self.artists, items):
+            self.apply(artist, item)
+            if not artist.get_visible():
+                artist.set_visible(True)
+        for artist in self.artists[n_items:]:
+            if artist.get_visible():
+                artist.set_visible(False)
+
+        if self.max_idle is not None:
+            keep = n_items + self.max_idle
+            for artist in self.artists[keep:]:
+                artist.remove()
+            del self.artists[keep:]
+
+        return self.artists[:n_items]
+
+    def __len__(self):
+        return self.length
+
+
+def _set_properties(artist, item):
+    artist.set(**item)
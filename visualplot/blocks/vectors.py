@@ -1,7 +1,15 @@
 import numpy as np
+from matplotlib.quiver import Quiver as _Quiver
 
 from visualplot.blocks.base import Block
 from visualplot.blocks.image_like import Pcolormesh
+from visualplot.framestore import FrameStore
+
+# the properties of the arrows carried over when they are thinned again
+_KEPT_PROPERTIES = ('alpha', 'visible', 'label', 'zorder', 'linewidth',
+                    'edgecolor', 'facecolor', 'cmap', 'clip_on', 'gid',
+                    'url', 'picker', 'animated', 'rasterized',
+                    'path_effects', 'hatch', 'antialiased')
 
 
 class Quiver(Block):
@@ -9,16 +17,17 @@ class Quiver(Block):
     A block or animated quiver plots
     """
 
-    def __init__(self, X, Y, U, V, ax=None, t_axis=0, **kwargs):
+    def __init__(self, X, Y, U, V, ax=None, t_axis=0, density=None,
+                 min_length=None, normalize=False, **kwargs):
         """
         :param X: 1D or 2D numpy array
             The x positions of the arrows. Cannot be animated.
         :param Y: 1D or 2D numpy array
             The y positions of the arrows. Cannot be animated.
-        :param U: 2D or 3D numpy array
+        :param U: 2D or 3D numpy array, list or FrameStore
             The U displacement of the arrows. 1 dimension
         higher than the X, Y arrays.
-        :param V: 2D or 3D numpy array
+        :param V: 2D or 3D numpy array, list or FrameStore
             The V displacement of the arrows. 1 dimension
         higher than the X, Y arrays.
         :param ax: matplotlib.axes.Axes, optional
@@ -26,14 +35,32 @@ class Quiver(Block):
         Defaults to matplotlib.pyplot.gca()
         :param t_axis: int, optional
             The axis of the array that represents time. Defaults to 0.
-        No effect if U, V are lists.
+        No effect if U, V are lists or FrameStores.
+        :param density: float, optional
+            The spacing between arrows, in pixels. If given, only every
+            n-th arrow of the grid within the current view is drawn, with n
+            chosen from the size of the axes so that arrows are about this
+            far apart. The arrows are chosen again whenever the axes are
+            zoomed, panned or resized. Requires X, Y to be a grid, either
+            2D arrays from meshgrid or 1D arrays of the x and y values.
+            Choosing the arrows again replaces ``self.Q`` with a new
+            matplotlib Quiver. Common properties set on the old one, such
+            as colors, alpha, zorder and linewidth, are copied to the new
+            one, but others (such as the line style) are not.
+        :param min_length: float, optional
+            Arrows shorter than this many pixels are not drawn. Defaults to
+            1 if density is given, and 0 otherwise.
+        :param normalize: bool, optional
+            Draw every arrow with unit length, showing only direction. Each
+            frame is normalized when it is shown. Defaults to False.
         :param kwargs:
+            Passed on to :meth:`matplotlib.axes.Axes.quiver`.
         """
         self.X = X
         self.Y = Y
-        self.U = np.asanyarray(U)
-        self.V = np.asanyarray(V)
-        if X.shape != Y.shape:
+        self.U = U if isinstance(U, FrameStore) else np.asanyarray(U)
+        self.V = V if isinstance(V, FrameStore) else np.asanyarray(V)
+        if X.shape != Y.shape and density is None:
             raise ValueError("X, Y must have the same shape")
         if self.U.shape != self.V.shape:
             raise ValueError("U, V must have the same shape")
@@ -41,14 +68,158 @@ class Quiver(Block):
         super().__init__(ax, t_axis)
 
         self._dim = len(self.U.shape)
-        self._is_list = isinstance(U, list)
+        self._is_list = isinstance(U, (list, FrameStore))
 
-        slice_s = self._make_slice(0, self._dim)
-        self.Q = self.ax.quiver(self.X, self.Y, self.U[slice_s], self.V[slice_s], **kwargs)
+        self.density = density
+        if min_length is None:
+            min_length = 0 if density is None else 1
+        self.min_length = min_length
+        self.normalize = normalize
 
-    def _update(self, i):
+        # the arrows to draw, as an index into the grid
+        self._index = Ellipsis
+        if density is not None:
+            if X.ndim == 1 and Y.ndim == 1:
+                X, Y = np.meshgrid(X, Y)
+            if X.ndim != 2 or X.shape != Y.shape:
+                raise ValueError("X, Y must be a grid to set the density")
+            self._x = X[0, :]
+            self._y = Y[:, 0]
+            self._grid = X, Y
+            # view the whole grid, not just the arrows drawn from it
+            self.ax.update_datalim([(np.nanmin(X), np.nanmin(Y)),
+                                    (np.nanmax(X), np.nanmax(Y))])
+            self.ax.autoscale_view()
+            self._index = self._view_index()
+
+        # reused for each frame
+        self._u = self._v = self._length = None
+
+        self._kwargs = kwargs
+        self.Q = self.ax.quiver(*self._grid_xy(), *self._frame_uv(0),
+                                **kwargs)
+
+        if density is not None:
+            self.ax.callbacks.connect('xlim_changed', self._rethin)
+            self.ax.callbacks.connect('ylim_changed', self._rethin)
+            self.ax.figure.canvas.mpl_connect('resize_event', self._rethin)
+
+    def _grid_xy(self):
+        if self.density is None:
+            return self.X, self.Y
+        return tuple(grid[self._index] for grid in self._grid)
+
+    def _frame_uv(self, i):
         slice_s = self._make_slice(i, self._dim)
-        self.Q.set_UVC(self.U[slice_s], self.V[slice_s])
+        U = self.U[slice_s][self._index]
+        V = self.V[slice_s][self._index]
+        if not self.normalize and not self.min_length:
+            return U, V
+
+        if self._u is None or self._u.shape != U.shape:
+            self._u = np.empty(U.shape)
+            self._v = np.empty(U.shape)
+            self._length = np.empty(U.shape)
+        np.hypot(U, V, out=self._length)
+        if self.normalize:
+            nonzero = self._length > 0
+            self._u.fill(0)
+            self._v.fill(0)
+            np.divide(U, self._length, out=self._u, where=nonzero)
+            np.divide(V, self._length, out=self._v, where=nonzero)
+            self._length[nonzero] = 1
+            U, V = self._u, self._v
+
+        pixels = self._pixels_per_unit()
+        if self.min_length and pixels is not None:
+            px, py = pixels
+            if px == py:
+                self._length *= px
+            else:
+                np.hypot(U * px, V * py, out=self._length)
+            hidden = self._length < self.min_length
+            U = np.ma.array(U, mask=hidden)
+            V = np.ma.array(V, mask=hidden)
+        return U, V
+
+    def _pixels_per_unit(self):
+        """
+        The length in pixels of the x and y components of an arrow of unit
+        length. These only differ when arrows are scaled in data units.
+        """
+        Q = getattr(self, 'Q', None)
+        # the scale is only known once the arrows have been drawn
+        if Q is None or Q.scale is None:
+            return None
+        if Q.scale_units == 'xy':
+            # measured about the middle of the view, so that nonlinear
+            # scales are roughly right
+            (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+            x, y = (x0 + x1) / 2, (y0 + y1) / 2
+            points = self.ax.transData.transform([(x, y), (x + 1, y),
+                                                  (x, y + 1)])
+            px, py = np.hypot(*(points[1:] - points[0]).T)
+            return px / Q.scale, py / Q.scale
+
+        bbox = self.ax.bbox
+        units = Q.units if Q.scale_units is None else Q.scale_units
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        dots = {'x': bbox.width / abs(x1 - x0),
+                'y': bbox.height / abs(y1 - y0),
+                'width': bbox.width,
+                'height': bbox.height,
+                'xy': (np.hypot(bbox.width, bbox.height) /
+                       np.hypot(x1 - x0, y1 - y0)),
+                'dots': 1.0,
+                'inches': self.ax.figure.dpi}[units]
+        return dots / Q.scale, dots / Q.scale
+
+    def _view_index(self):
+        """The grid rows and columns to draw within the current view"""
+        bbox = self.ax.bbox
+        index = []
+        for values, limits, pixels in ((self._y, self.ax.get_ylim(),
+                                        bbox.height),
+                                       (self._x, self.ax.get_xlim(),
+                                        bbox.width)):
+            lo, hi = min(limits), max(limits)
+            inside = np.flatnonzero((values >= lo) & (values <= hi))
+            if not len(inside):
+                index.append(slice(0, 0))
+                continue
+            # the average grid spacing, in pixels
+            span = abs(values[inside[-1]] - values[inside[0]])
+            spacing = span / max(len(inside) - 1, 1) * pixels / (hi - lo)
+            step = max(int(np.ceil(self.density / spacing)), 1) \
+                if spacing else 1
+            # keep to the same arrows as the view moves
+            start = -(-inside[0] // step) * step
+            index.append(slice(start, inside[-1] + 1, step))
+        return tuple(index)
+
+    def _rethin(self, *args):
+        index = self._view_index()
+        if index == self._index:
+            return
+        self._index = index
+        if 'scale' not in self._kwargs and self.Q.scale is not None:
+            # keep arrows the same length as they are thinned
+            self._kwargs = dict(self._kwargs, scale=self.Q.scale)
+        old = self.Q
+        old.remove()
+        # the grid is already in the data limits, and changing them from
+        # a limit callback would call it again
+        self.Q = _Quiver(self.ax, *self._grid_xy(),
+                         *self._frame_uv(self._frame), **self._kwargs)
+        # keep what was set on the arrows since they were made
+        for name in _KEPT_PROPERTIES:
+            getattr(self.Q, f'set_{name}')(getattr(old, f'get_{name}')())
+        self.Q.norm = old.norm
+        self.ax.add_collection(self.Q, autolim=False)
+
+    def _update(self, i):
+        self._frame = i
+        self.Q.set_UVC(*self._frame_uv(i))
         return self.Q
 
     def __len__(self):
@@ -56,6 +227,11 @@ class Quiver(Block):
             return self.U.shape[0]
         return self.U.shape[self.t_axis]
 
+    def _frame_data(self, i):
+        slice_s = self._make_slice(i, self._dim)
+        return (self.X, self.Y, self.U[slice_s], self.V[slice_s],
+                self.density, self.min_length, self.normalize)
+
 
 def vector_comp(X, Y, U, V, skip=5, *, t_axis=0, pcolor_kw={}, quiver_kw={}):
     """
@@ -75,10 +251,12 @@ def vector_comp(X, Y, U, V, skip=5, *, t_axis=0, pcolor_kw={}, quiver_kw={}):
         The x components of the vectors to be animated.
     :param V: 3D numpy array
         The y components of the vectors to be animated.
-    :param skip: int, optional
+    :param skip: int or None, optional
         The amount of values to skip over when making the quiver plot.
         Higher skip means fewer arrows. For best results, the skip should
-        divide the length of the data-1. Defaults to 5.
+        divide the length of the data-1. Defaults to 5. If None, the
+        arrows are thinned to suit the size of the axes and the view; see
+        the ``density`` parameter of Quiver, which can be set in quiver_kw.
     :param t_axis: int, optional
         The axis of the U, V array's the represent time. Defaults to 0. Note
         this is different from the defaults that blocks choose. This default
@@ -96,6 +274,14 @@ def vector_comp(X, Y, U, V, skip=5, *, t_axis=0, pcolor_kw={}, quiver_kw={}):
     magnitude = np.sqrt(U ** 2 + V ** 2)
     pcolor_block = Pcolormesh(X, Y, magnitude, t_axis=t_axis, **pcolor_kw)
 
+    # plot the direction of the vectors as a quiver plot, normalizing
+    # each frame as it is shown
+    if skip is None:
+        quiver_kw = dict({'density': 25}, **quiver_kw)
+        quiver_block = Quiver(X, Y, U, V, t_axis=t_axis, normalize=True,
+                              **quiver_kw)
+        return [pcolor_block, quiver_block]
+
     # use a subset of the data to plot the arrows as a quiver plot.
     xy_slice = tuple([slice(None, None, skip)] * len(X.shape))
 
@@ -103,9 +289,7 @@ def vector_comp(X, Y, U, V, skip=5, *, t_axis=0, pcolor_kw={}, quiver_kw={}):
     uv_slice[t_axis] = slice(None)
     uv_slice = tuple(uv_slice)
 
-    quiver_block = Quiver(X[xy_slice], Y[xy_slice],
-                          U[uv_slice] / magnitude[uv_slice],
-                          V[uv_slice] / magnitude[uv_slice],
-                          t_axis=t_axis, **quiver_kw)
+    quiver_block = Quiver(X[xy_slice], Y[xy_slice], U[uv_slice], V[uv_slice],
+                          t_axis=t_axis, normalize=True, **quiver_kw)
 
     return [pcolor_block, quiver_block]
@@ -0,0 +1,221 @@
+import enum
+import hashlib
+import os
+import zlib
+from io import BytesIO
+
+import numpy as np
+from cycler import Cycler
+from matplotlib.colors import Colormap, Normalize
+
+# types whose repr describes them fully
+_PLAIN = (str, int, float, complex, bool, type(None), np.generic, np.dtype,
+          slice, range, enum.Enum, Cycler)
+# the settings of the different kinds of norm
+_NORM_ATTRIBUTES = ('vmin', 'vmax', 'clip', 'vcenter', 'halfrange',
+                    'boundaries', 'ncolors', 'extend', 'gamma', 'linthresh',
+                    'linscale', 'base')
+
+
+class RenderCache:
+    """
+    An on-disk cache of rendered frames.
+    Frames are stored as zlib-compressed RGBA buffers, addressed by a hash of
+    everything that went into drawing them. The cache is capped in size; when it grows
+    past the cap the least recently used frames are evicted first.
+    """
+
+    def __init__(self, directory, max_bytes=2 ** 30, level=1):
+        """
+        :param directory: str
+            The directory to keep the cached frames in. It is created if it
+            does not exist, and may be shared between runs and processes.
+        :param max_bytes: int, optional
+            The maximum total size of the cached frames, as stored.
+            Defaults to 1 GiB.
+        :param level: int, optional
+            The zlib compression level. Plots are mostly flat color, so
+            even the fastest level shrinks frames many times over.
+            Defaults to 1.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.level = level
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def __len__(self):
+        return sum(1 for _ in self._entries())
+
+    @staticmethod
+    def key(*parts):
+        """
+        Hash arbitrary frame inputs into a cache key.
+
+        :param parts:
+            numpy arrays, strings, numbers, colormaps, norms, and (nested)
+            lists, tuples and dicts of those.
+        :return: str
+        :raises TypeError: if a part is of any other type, as it cannot be
+            told apart reliably from a changed one.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        _feed(h, parts)
+        return h.hexdigest()
+
+    def get(self, key):
+        """
+        :param key: str
+        :return: bytes or None
+            The cached frame, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        # mark as recently used
+        os.utime(path)
+        return zlib.decompress(data)
+
+    def put(self, key, data):
+        """
+        :param key: str
+        :param data: bytes
+            The raw frame to store.
+        """
+        path = self._path(key)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        data = zlib.compress(data, self.level)
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def clear(self):
+        """Remove every frame from the cache"""
+        for entry in self._entries():
+            os.remove(entry.path)
+        self._size = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.rgba.z')
+
+    def _entries(self):
+        with os.scandir(self.directory) as it:
+            return [entry for entry in it if entry.name.endswith('.rgba.z')]
+
+    def _evict(self):
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+
+class _CachedFigure:
+    """
+    Stands in for a figure when handed to a matplotlib writer, so that
+    cached frames are fed to the writer instead of being drawn again.
+    ``draw(frame)`` is only called for frames missing from the cache.
+    """
+
+    def __init__(self, fig, cache, draw):
+        self._fig = fig
+        self._cache = cache
+        self._draw = draw
+        self.frame = 0
+        self.key = None
+        self.hits = 0
+
+    def __getattr__(self, name):
+        return getattr(self._fig, name)
+
+    def savefig(self, fname, *, format, dpi, **kwargs):
+        data = None
+        if self.key is not None:
+            data = self._cache.get(self.key)
+        if data is None:
+            self._draw(self.frame)
+            buf = BytesIO()
+            self._fig.savefig(buf, format='rgba', dpi=dpi, **kwargs)
+            data = buf.getvalue()
+            if self.key is not None:
+                self._cache.put(self.key, data)
+        else:
+            self.hits += 1
+
+        if format in ('rgba', 'raw'):
+            fname.write(data)
+        else:
+            from PIL import Image
+
+            w = int(self._fig.get_size_inches()[0] * dpi)
+            size = (w, len(data) // (4 * w))
+            im = Image.frombuffer('RGBA', size, data, 'raw', 'RGBA', 0, 1)
+            # Pillow names formats by their main extension, e.g. 'jpg' is
+            # 'JPEG'
+            format = Image.registered_extensions().get(f'.{format.lower()}',
+                                                       format)
+            if format == 'JPEG':
+                im = im.convert('RGB')
+            im.save(fname, format=format)
+
+
+def _feed(h, obj):
+    if isinstance(obj, np.ma.MaskedArray):
+        h.update(b'masked(')
+        _feed(h, obj.data)
+        _feed(h, np.ma.getmaskarray(obj))
+        h.update(b')')
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            _feed(h, list(obj))
+            return
+        h.update(f'{obj.dtype.str}{obj.shape}'.encode())
+        h.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, (list, tuple)):
+        h.update(f'{type(obj).__name__}{len(obj)}('.encode())
+        for item in obj:
+            _feed(h, item)
+        h.update(b')')
+    elif isinstance(obj, dict):
+        h.update(f'dict{len(obj)}('.encode())
+        for key in sorted(obj, key=repr):
+            _feed(h, key)
+            _feed(h, obj[key])
+        h.update(b')')
+    elif isinstance(obj, bytes):
+        h.update(obj)
+    elif isinstance(obj, Colormap):
+        # the repr of a colormap holds its address, so hash its colors
+        _feed(h, ('Colormap', obj.name, obj(np.linspace(0, 1, obj.N)),
+                  obj.get_bad(), obj.get_under(), obj.get_over()))
+    elif isinstance(obj, Normalize):
+        _feed(h, (type(obj).__name__,
+                  {name: getattr(obj, name) for name in _NORM_ATTRIBUTES
+                   if hasattr(obj, name)}))
+    elif isinstance(obj, _PLAIN):
+        h.update(repr(obj).encode())
+    else:
+        raise TypeError(f"Cannot make a cache key from {type(obj).__name__}")
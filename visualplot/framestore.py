@@ -0,0 +1,225 @@
+import lzma
+import threading
+import warnings
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+_COMPRESSORS = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+
+class FrameStore:
+    """
+    A compact in-memory store for the frames of an animation.
+    Frames can be quantized to 8 or 16 bit integers, with a scale and offset
+    kept for each frame, and chunks of frames can be compressed. Frames are
+    decoded when they are indexed, so a block only ever holds a few of them
+    at full precision.
+
+    Blocks that animate arrays of frames (``Imshow``, ``Pcolormesh`` and
+    ``Quiver``) accept a FrameStore wherever they accept a list of frames.
+    """
+
+    def __init__(self, data, t_axis=0, dtype=np.uint8, compression=None,
+                 level=None, chunksize=16, prefetch=0):
+        """
+        :param data: numpy array, or list of numpy arrays
+            The frames to store. Arrays may be memory-mapped; they are read
+            one chunk of frames at a time.
+        :param t_axis: int, optional
+            The axis of the array that represents time. Defaults to 0.
+            No effect if data is a list.
+        :param dtype: numpy.uint8, numpy.uint16 or None, optional
+            The integer type to quantize each frame to. NaNs are preserved.
+            Integer frames that fit in this type are stored exactly, and
+            other integer frames are returned in their own type.
+            If None, frames are stored unquantized. Defaults to uint8.
+        :param compression: 'zlib', 'lzma' or None, optional
+            How to compress each chunk of frames. Defaults to None.
+        :param level: int, optional
+            The compression level (the preset, for lzma).
+        :param chunksize: int, optional
+            The number of frames stored, compressed and decoded together.
+            Defaults to 16.
+        :param prefetch: int, optional
+            The number of chunks to decode ahead of the one being played,
+            in a background thread. Defaults to 0.
+        """
+        if compression is not None and compression not in _COMPRESSORS:
+            raise ValueError(f"compression must be one of "
+                             f"{list(_COMPRESSORS)} or None")
+        if dtype is not None and np.dtype(dtype) not in (np.uint8, np.uint16):
+            raise ValueError("dtype must be numpy.uint8, numpy.uint16 or None")
+
+        self.compression = compression
+        self.level = level
+        self.chunksize = chunksize
+        self.prefetch = prefetch
+
+        is_list = isinstance(data, list)
+        if not is_list:
+            data = np.moveaxis(np.asanyarray(data), t_axis, 0)
+        self._len = len(data)
+        frame = np.asanyarray(data[0])
+        self._frame_shape = frame.shape
+
+        self._integer = frame.dtype.kind in 'biu'
+        # integers that fit the codes need no quantizing to be stored exactly
+        self._quantized = dtype is not None and not (
+            self._integer and np.can_cast(frame.dtype, dtype))
+        if not self._quantized:
+            self._code_dtype = frame.dtype
+            self.dtype = frame.dtype
+        else:
+            self._code_dtype = np.dtype(dtype)
+            if self._integer:
+                self.dtype = frame.dtype
+            else:
+                self.dtype = np.result_type(frame.dtype, np.float32)
+            self.scale = np.empty(self._len)
+            self.offset = np.empty(self._len)
+
+        self._chunks = []
+        for start in range(0, self._len, chunksize):
+            stop = min(start + chunksize, self._len)
+            if is_list:
+                chunk = np.stack([np.asanyarray(f) for f in data[start:stop]])
+            else:
+                chunk = np.asarray(data[start:stop])
+            if chunk.shape[1:] != self._frame_shape:
+                raise ValueError("All frames must have the same shape")
+            self._chunks.append(self._encode(start, chunk))
+
+        self._decoded = {}
+        self._executor = None
+        # frames may be read from several threads, e.g. by autoscale
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self):
+        return (self._len,) + self._frame_shape
+
+    @property
+    def ndim(self):
+        return len(self._frame_shape) + 1
+
+    @property
+    def nbytes(self):
+        """The memory used to store the frames"""
+        encoded = sum(len(chunk) if isinstance(chunk, bytes) else chunk.nbytes
+                      for chunk in self._chunks)
+        if not self._quantized:
+            return encoded
+        return encoded + self.scale.nbytes + self.offset.nbytes
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if not isinstance(i, (int, np.integer)):
+            raise TypeError("FrameStore can only be indexed by frame number")
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("frame index out of range")
+
+        k, j = divmod(i, self.chunksize)
+        codes = self._chunk(k)[j]
+        if not self._quantized:
+            return codes
+        return self._dequantize(i, codes)
+
+    def __array__(self, dtype=None, copy=None):
+        frames = np.stack([self[i] for i in range(self._len)])
+        return frames if dtype is None else frames.astype(dtype)
+
+    def _encode(self, start, chunk):
+        if self._quantized:
+            chunk = self._quantize(start, chunk)
+        if self.compression is None:
+            return np.ascontiguousarray(chunk)
+
+        compress, _ = _COMPRESSORS[self.compression]
+        if self.level is None:
+            return compress(chunk.tobytes())
+        if self.compression == 'lzma':
+            return compress(chunk.tobytes(), preset=self.level)
+        return compress(chunk.tobytes(), self.level)
+
+    def _quantize(self, start, chunk):
+        # the largest code is kept for NaN
+        top = np.iinfo(self._code_dtype).max - 1
+        flat = chunk.reshape(len(chunk), -1)
+        with warnings.catch_warnings():
+            # all-NaN frames are allowed, and are stored as NaN codes
+            warnings.simplefilter('ignore', RuntimeWarning)
+            lo = np.nanmin(flat, axis=1) if flat.size else np.zeros(len(flat))
+            hi = np.nanmax(flat, axis=1) if flat.size else np.zeros(len(flat))
+        lo = np.where(np.isfinite(lo), lo, 0).astype(float)
+        hi = np.where(np.isfinite(hi), hi, 0).astype(float)
+        scale = (hi - lo) / top
+        if self._integer:
+            # whole steps, so that frames with a small range are exact
+            scale = np.ceil(scale)
+        scale[scale == 0] = 1
+
+        self.offset[start:start + len(chunk)] = lo
+        self.scale[start:start + len(chunk)] = scale
+
+        expand = (slice(None),) + (None,) * (chunk.ndim - 1)
+        codes = np.rint((chunk - lo[expand]) / scale[expand])
+        codes[np.isnan(chunk)] = top + 1
+        return codes.astype(self._code_dtype)
+
+    def _dequantize(self, i, codes):
+        if self._integer:
+            frame = codes * self.scale[i] + self.offset[i]
+            return np.rint(frame).astype(self.dtype)
+        frame = codes.astype(self.dtype)
+        frame *= self.scale[i]
+        frame += self.offset[i]
+        frame[codes == np.iinfo(self._code_dtype).max] = np.nan
+        return frame
+
+    def _decode(self, k):
+        chunk = self._chunks[k]
+        if self.compression is None:
+            return chunk
+        _, decompress = _COMPRESSORS[self.compression]
+        n_frames = min(self.chunksize, self._len - k * self.chunksize)
+        codes = np.frombuffer(decompress(chunk), dtype=self._code_dtype)
+        return codes.reshape((n_frames,) + self._frame_shape)
+
+    def _chunk(self, k):
+        if self.compression is None:
+            return self._chunks[k]
+
+        with self._lock:
+            # keep the current chunk, and the ones decoded ahead of it
+            wanted = range(k, min(k + 1 + self.prefetch, len(self._chunks)))
+            for stale in [key for key in self._decoded if key not in wanted]:
+                del self._decoded[stale]
+            if self.prefetch:
+                for ahead in wanted:
+                    if ahead not in self._decoded:
+                        self._decoded[ahead] = self._submit(ahead)
+            decoded = self._decoded.get(k)
+
+        if self.prefetch:
+            return decoded.result()
+        if decoded is None:
+            # decoded outside the lock, so that threads reading different
+            # chunks decode them at the same time
+            decoded = self._decode(k)
+            with self._lock:
+                self._decoded[k] = decoded
+        return decoded
+
+    def _submit(self, k):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1)
+        return self._executor.submit(self._decode, k)
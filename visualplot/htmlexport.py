@@ -0,0 +1,268 @@
+import base64
+import json
+import uuid
+import zlib
+from io import BytesIO
+
+import numpy as np
+
+_TEMPLATE = """\
+<div class="visualplot" id="__ID__">
+  <canvas id="__ID__-canvas" width="__WIDTH__" height="__HEIGHT__"
+          style="max-width: 100%;"></canvas>
+  <div style="display: flex; align-items: center; gap: 0.5em;">
+    <label>__TEXT__
+      <input id="__ID__-slider" type="range" min="0" max="__MAX__" step="1"
+             value="0">
+    </label>
+    <span id="__ID__-time"></span>
+    <button id="__ID__-button">Pause</button>
+  </div>
+__CHUNKS__
+  <script>
+  (function () {
+    var id = "__ID__", width = __WIDTH__, height = __HEIGHT__;
+    var length = __LENGTH__, chunksize = __CHUNKSIZE__, fps = __FPS__;
+    var times = __TIMES__;
+    var frameBytes = width * height * 4;
+
+    var canvas = document.getElementById(id + "-canvas");
+    var context = canvas.getContext("2d");
+    var image = context.createImageData(width, height);
+    var slider = document.getElementById(id + "-slider");
+    var label = document.getElementById(id + "-time");
+    var button = document.getElementById(id + "-button");
+
+    // chunks are inflated as they are played, a frame at a time, so only
+    // the frame on show is held in memory
+    function Reader(k) {
+      var text = document.getElementById(id + "-chunk-" + k).textContent;
+      var binary = atob(text.trim());
+      var bytes = new Uint8Array(binary.length);
+      for (var j = 0; j < binary.length; j++) {
+        bytes[j] = binary.charCodeAt(j);
+      }
+      this.chunk = k;
+      this.next = 0;
+      this.frame = new Uint8Array(frameBytes);
+      this.piece = new Uint8Array(0);
+      this.stream = new Blob([bytes]).stream()
+        .pipeThrough(new DecompressionStream("deflate")).getReader();
+    }
+
+    // read the next frame of the chunk into this.frame. The first frame of
+    // a chunk is whole, the rest are differences from the frame before
+    Reader.prototype.read = function () {
+      var reader = this, filled = 0;
+      function fill() {
+        while (filled < frameBytes && reader.piece.length) {
+          var piece = reader.piece, frame = reader.frame;
+          var n = Math.min(frameBytes - filled, piece.length);
+          if (reader.next === 0) {
+            frame.set(piece.subarray(0, n), filled);
+          } else {
+            for (var j = 0; j < n; j++) {
+              frame[filled + j] = (frame[filled + j] + piece[j]) & 255;
+            }
+          }
+          filled += n;
+          reader.piece = piece.subarray(n);
+        }
+        if (filled === frameBytes) {
+          reader.next++;
+          return Promise.resolve();
+        }
+        return reader.stream.read().then(function (result) {
+          if (result.done) {
+            throw new Error("chunk " + reader.chunk + " is truncated");
+          }
+          reader.piece = result.value;
+          return fill();
+        });
+      }
+      return fill();
+    };
+
+    var reader = null;
+
+    function seek(i) {
+      var k = Math.floor(i / chunksize), j = i - k * chunksize;
+      // going back within a chunk means inflating it again from the start
+      if (reader === null || reader.chunk !== k || reader.next > j + 1) {
+        if (reader !== null) {
+          reader.stream.cancel();
+        }
+        reader = new Reader(k);
+      }
+      function advance() {
+        if (reader.next > j) {
+          return Promise.resolve(reader.frame);
+        }
+        return reader.read().then(advance);
+      }
+      return advance();
+    }
+
+    var index = 0, playing = true, pending = false;
+    var queue = Promise.resolve();
+
+    function show(i) {
+      index = i;
+      slider.value = i;
+      label.textContent = times[i];
+      queue = queue.then(function () {
+        // skip frames that were passed over while waiting
+        if (index !== i) {
+          return;
+        }
+        return seek(i).then(function (frame) {
+          // frames are stored as separate red, green, blue & alpha planes
+          var pixels = image.data, n = width * height;
+          for (var p = 0, o = 0; p < n; p++, o += 4) {
+            pixels[o] = frame[p];
+            pixels[o + 1] = frame[p + n];
+            pixels[o + 2] = frame[p + 2 * n];
+            pixels[o + 3] = frame[p + 3 * n];
+          }
+          context.putImageData(image, 0, 0);
+        });
+      }).catch(function (error) {
+        console.error(error);
+      });
+      return queue;
+    }
+
+    button.onclick = function () {
+      playing = !playing;
+      button.textContent = playing ? "Pause" : "Play";
+    };
+    slider.oninput = function () {
+      show(parseInt(slider.value, 10));
+    };
+    setInterval(function () {
+      if (playing && !pending) {
+        pending = true;
+        show((index + 1) % length).then(function () {
+          pending = false;
+        });
+      }
+    }, 1000 / fps);
+    show(0);
+  })();
+  </script>
+</div>
+"""
+
+
+def render_html(visualization, chunksize=50, dpi=None, text='Time',
+                valfmt=None, level=6):
+    """
+    Render a visualization as a self-contained HTML player.
+    Frames are grouped into chunks. The first frame of each chunk is stored
+    whole and the rest as differences from the frame before, with the color
+    channels stored as separate planes, and each chunk is compressed. Most
+    of a frame is usually unchanged from the one before, so the page is far
+    smaller than one holding every frame as an image.
+    Any matplotlib slider or play button of the visualization is left out
+    of the frames, as the player has its own.
+    The browser decompresses frames one at a time as they are played, so it
+    only ever holds the frame on show. Seeking back within a chunk
+    decompresses the chunk again from its start.
+
+    :param visualization: visualplot.visualization.Visualization
+    :param chunksize: int, optional
+        The number of frames in each chunk. Larger chunks compress better,
+        smaller ones seek faster. Defaults to 50.
+    :param dpi: float, optional
+        The resolution to render frames at. Defaults to the figure's dpi.
+    :param text: str, optional
+        The text to display for the slider. Defaults to 'Time'
+    :param valfmt: str, optional
+        a format specifier used to print the time
+    :param level: int, optional
+        The zlib compression level. Defaults to 6.
+    :return: str
+    """
+    fig = visualization.fig
+    timeline = visualization.timeline
+    if dpi is None:
+        dpi = fig.dpi
+
+    # the player has its own controls, so matplotlib's are left out
+    controls = [getattr(visualization, name) for name in
+                ('slider_ax', 'button_ax') if hasattr(visualization, name)]
+    visible = [ax.get_visible() for ax in controls]
+    current = timeline.index % max(timeline._len, 1)
+    try:
+        for ax in controls:
+            ax.set_visible(False)
+        chunks, width, height = _render_chunks(visualization, chunksize, dpi,
+                                               level)
+    finally:
+        for ax, was_visible in zip(controls, visible):
+            ax.set_visible(was_visible)
+        if timeline._len:
+            visualization._draw_frame(current)
+
+    valfmt = visualization._time_format(valfmt)
+    if timeline.log:
+        valfmt = '10^' + valfmt
+    times = [(valfmt + timeline.units) % timeline[i]
+             for i in range(timeline._len)]
+
+    player_id = 'visualplot-' + uuid.uuid4().hex
+    chunk_html = '\n'.join(
+        f'  <script type="text/plain" id="{player_id}-chunk-{k}">'
+        f'{chunk}</script>'
+        for k, chunk in enumerate(chunks))
+    replacements = {
+        '__ID__': player_id,
+        '__WIDTH__': str(width),
+        '__HEIGHT__': str(height),
+        '__MAX__': str(timeline._len - 1),
+        '__LENGTH__': str(timeline._len),
+        '__CHUNKSIZE__': str(chunksize),
+        '__FPS__': str(timeline.fps),
+        '__TIMES__': json.dumps(times).replace('</', '<\\/'),
+        '__TEXT__': _escape(text),
+        '__CHUNKS__': chunk_html,
+    }
+    html = _TEMPLATE
+    for key, value in replacements.items():
+        html = html.replace(key, value)
+    return html
+
+
+def _render_chunks(visualization, chunksize, dpi, level):
+    fig = visualization.fig
+    length = visualization.timeline._len
+    chunks = []
+    width = height = None
+    previous = None
+    for start in range(0, length, chunksize):
+        compress = zlib.compressobj(level)
+        data = []
+        for i in range(start, min(start + chunksize, length)):
+            visualization._draw_frame(i)
+            buf = BytesIO()
+            fig.savefig(buf, format='rgba', dpi=dpi)
+            frame = np.frombuffer(buf.getbuffer(), dtype=np.uint8)
+            if width is None:
+                width = int(fig.get_size_inches()[0] * dpi)
+                height = len(frame) // (4 * width)
+            # separate color planes compress better than interleaved pixels
+            frame = frame.reshape(-1, 4).T
+            if i == start:
+                data.append(compress.compress(frame.tobytes()))
+            else:
+                # uint8 arithmetic wraps, which the player undoes
+                data.append(compress.compress((frame - previous).tobytes()))
+            previous = frame
+        data.append(compress.flush())
+        chunks.append(base64.b64encode(b''.join(data)).decode('ascii'))
+    return chunks, width, height
+
+
+def _escape(text):
+    return (text.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;'))
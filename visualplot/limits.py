@@ -0,0 +1,115 @@
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def frame_limits(data, t_axis=0, percentile=None, chunksize=64, workers=None):
+    """
+    Compute the lower and upper limit of every frame in one pass.
+    The data is read a chunk of frames at a time, so memory-mapped arrays
+    are never loaded whole. Chunks are reduced in parallel. NaNs are
+    ignored; a frame that is all NaN has NaN limits.
+
+    :param data: numpy array, or a sequence of arrays
+        The data to find the limits of.
+    :param t_axis: int or None, optional
+        The axis of the array that represents time. Defaults to 0.
+        If None, data is indexed by frame number instead, as for lists.
+    :param percentile: float or (float, float), optional
+        Use percentiles rather than the minimum and maximum. A single value
+        p is taken as (p, 100 - p).
+    :param chunksize: int, optional
+        The number of frames to read at a time. Defaults to 64.
+    :param workers: int, optional
+        The number of threads to use. Defaults to the number of CPUs.
+    :return: numpy array of floats, of shape (T, 2)
+    """
+    if percentile is not None and np.ndim(percentile) == 0:
+        percentile = (percentile, 100 - percentile)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    length = len(data) if t_axis is None else data.shape[t_axis]
+    starts = range(0, length, chunksize)
+
+    def reduce(start):
+        stop = min(start + chunksize, length)
+        return _chunk_limits(data, t_axis, start, stop, percentile)
+
+    with warnings.catch_warnings():
+        # all-NaN frames are allowed, and give NaN limits
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if workers == 1 or len(starts) == 1:
+            chunks = [reduce(start) for start in starts]
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                chunks = list(executor.map(reduce, starts))
+
+    if not chunks:
+        return np.empty((0, 2))
+    return np.concatenate(chunks).astype(float, copy=False)
+
+
+def compute_limits(data, t_axis=0, window=None, percentile=None,
+                   chunksize=64, workers=None):
+    """
+    Compute limits that hold for the whole animation, or for a rolling
+    window of frames.
+
+    :param data: numpy array, or a sequence of arrays
+        The data to find the limits of.
+    :param t_axis: int or None, optional
+        The axis of the array that represents time. Defaults to 0.
+        If None, data is indexed by frame number instead, as for lists.
+    :param window: int, optional
+        If given, the limits of each frame are taken over the ``window``
+        frames centred on it, rather than over the whole animation.
+    :param percentile: float or (float, float), optional
+        Use percentiles rather than the minimum and maximum.
+        See :func:`frame_limits`.
+    :param chunksize: int, optional
+        The number of frames to read at a time. Defaults to 64.
+    :param workers: int, optional
+        The number of threads to use. Defaults to the number of CPUs.
+    :return: numpy array
+        Of shape (2,) for global limits, or (T, 2) for rolling limits.
+    """
+    limits = frame_limits(data, t_axis, percentile, chunksize, workers)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if window is None:
+            return np.array([np.nanmin(limits[:, 0]), np.nanmax(limits[:, 1])])
+
+        before = (window - 1) // 2
+        after = window - 1 - before
+        padded = np.pad(limits, ((before, after), (0, 0)),
+                        constant_values=np.nan)
+        windows = np.lib.stride_tricks.sliding_window_view(
+            padded, window, axis=0)
+        return np.column_stack((np.nanmin(windows[:, 0], axis=1),
+                                np.nanmax(windows[:, 1], axis=1)))
+
+
+def _chunk_limits(data, t_axis, start, stop, percentile):
+    if t_axis is None:
+        limits = np.full((stop - start, 2), np.nan)
+        for i in range(start, stop):
+            frame = np.asarray(data[i], dtype=float).ravel()
+            if frame.size:
+                limits[i - start] = _limits(frame[None], percentile)[0]
+        return limits
+
+    index = [slice(None)] * data.ndim
+    index[t_axis] = slice(start, stop)
+    chunk = np.moveaxis(np.asarray(data[tuple(index)]), t_axis, 0)
+    return _limits(chunk.reshape(stop - start, -1), percentile)
+
+
+def _limits(frames, percentile):
+    if percentile is None:
+        return np.column_stack((np.nanmin(frames, axis=1),
+                                np.nanmax(frames, axis=1)))
+    return np.nanpercentile(frames, percentile, axis=1).T
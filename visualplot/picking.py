@@ -0,0 +1,126 @@
+import heapq
+
+import numpy as np
+
+
+class PointIndex:
+    """
+    A k-d tree of 2D points, for fast nearest point queries.
+    The points are split in half again and again, along whichever side of
+    their bounding box is longer, so every leaf holds about the same number
+    of points however the points are clustered. A query only looks at the
+    leaves that could hold a point nearer than the nearest found so far.
+    """
+
+    # the most points kept in a leaf
+    leaf_size = 128
+
+    def __init__(self, x, y):
+        """
+        :param x: 1D numpy array
+            The x positions of the points.
+        :param y: 1D numpy array
+            The y positions of the points. Points that are not finite are
+            left out of the index.
+        """
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if x.shape != y.shape:
+            raise ValueError("x, y must have the same shape")
+        index = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+
+        # each node is the range of points it holds, in the order of the
+        # tree, their bounding box, and its children
+        self._ranges = []
+        self._boxes = []
+        self._children = []
+        if len(index):
+            self._build(x, y, index)
+        self.x = x[index]
+        self.y = y[index]
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def nearest(self, x, y, radius=np.inf, scale=(1., 1.)):
+        """
+        Find the point nearest to (x, y).
+
+        :param x: float
+        :param y: float
+        :param radius: float, optional
+            Only find points within this distance.
+        :param scale: (float, float), optional
+            Scales the x and y distances before they are compared, e.g. to
+            measure distance in pixels rather than data units.
+        :return: int or None
+            The position of the point in the arrays the index was built
+            from, or None if there is no point within the radius.
+        """
+        if not len(self):
+            return None
+        sx, sy = scale
+
+        best, best_dist = None, radius
+        # visit the nodes nearest the query first
+        heap = [(self._box_distance(0, x, y, sx, sy), 0)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if dist > best_dist:
+                break
+            children = self._children[node]
+            if children is not None:
+                for child in children:
+                    child_dist = self._box_distance(child, x, y, sx, sy)
+                    if child_dist <= best_dist:
+                        heapq.heappush(heap, (child_dist, child))
+                continue
+
+            start, stop = self._ranges[node]
+            dist = np.hypot((self.x[start:stop] - x) * sx,
+                            (self.y[start:stop] - y) * sy)
+            k = np.argmin(dist)
+            if dist[k] <= best_dist:
+                best, best_dist = start + k, dist[k]
+
+        if best is None:
+            return None
+        return int(self.index[best])
+
+    def _box_distance(self, node, x, y, sx, sy):
+        x0, x1, y0, y1 = self._boxes[node]
+        dx = max(x0 - x, x - x1, 0.) * sx
+        dy = max(y0 - y, y - y1, 0.) * sy
+        return (dx * dx + dy * dy) ** 0.5
+
+    def _build(self, x, y, index):
+        # index is reordered in place, so each node's points are contiguous
+        self._ranges.append((0, len(index)))
+        self._boxes.append(None)
+        self._children.append(None)
+        nodes = [0]
+        while nodes:
+            node = nodes.pop()
+            start, stop = self._ranges[node]
+            xs, ys = x[index[start:stop]], y[index[start:stop]]
+            box = (xs.min(), xs.max(), ys.min(), ys.max())
+            self._boxes[node] = tuple(float(v) for v in box)
+            if stop - start <= self.leaf_size:
+                continue
+
+            # split the longer side at the median
+            coords = xs if box[1] - box[0] >= box[3] - box[2] else ys
+            middle = (stop - start) // 2
+            order = np.argpartition(coords, middle)
+            index[start:stop] = index[start:stop][order]
+
+            children = []
+            for child_range in ((start, start + middle),
+                                (start + middle, stop)):
+                children.append(len(self._ranges))
+                nodes.append(len(self._ranges))
+                self._ranges.append(child_range)
+                self._boxes.append(None)
+                self._children.append(None)
+            self._children[node] = tuple(children)
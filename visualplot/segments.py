@@ -0,0 +1,260 @@
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+
+import matplotlib as mpl
+
+
+class Manifest:
+    """
+    Records how an export is split into segments, and which segments have
+    been completed. The manifest is kept as ``manifest.json`` in the export
+    directory, and is safe to update from several processes or machines
+    sharing the directory.
+    """
+
+    filename = 'manifest.json'
+    # a lock older than this (in seconds) is taken to be left by a crash
+    stale_lock = 60
+    # a claim not renewed for this long (in seconds) is taken to be left by
+    # a crash; claims are renewed three times as often
+    stale_claim = 60
+
+    def __init__(self, directory, n_frames, segment_length, extension):
+        """
+        :param directory: str
+            The export directory. Created if it does not exist.
+        :param n_frames: int
+            The number of frames in the whole export.
+        :param segment_length: int
+            The number of frames in each segment.
+        :param extension: str
+            The file extension of the segments, e.g. '.mp4'.
+        """
+        self.directory = directory
+        self.n_frames = n_frames
+        self.segment_length = segment_length
+        self.extension = extension
+        self.owner = {'host': socket.gethostname(), 'pid': os.getpid()}
+        # the threads renewing this process's claims, by segment start
+        self._renewals = {}
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock():
+            state = self._read()
+            if state is None:
+                self._write({'n_frames': n_frames,
+                             'segment_length': segment_length,
+                             'extension': extension,
+                             'completed': [],
+                             'claimed': {}})
+            elif (state['n_frames'], state['segment_length'],
+                  state['extension']) != (n_frames, segment_length,
+                                          extension):
+                raise ValueError(
+                    f"The export in {directory} has {state['n_frames']} "
+                    f"frames in segments of {state['segment_length']} "
+                    f"written as {state['extension']}, which does not match")
+
+    @classmethod
+    def load(cls, directory):
+        """Open the manifest of an existing export"""
+        with open(os.path.join(directory, cls.filename)) as f:
+            state = json.load(f)
+        return cls(directory, state['n_frames'], state['segment_length'],
+                   state['extension'])
+
+    def segments(self, start=0, stop=None):
+        """
+        The (start, stop) frame ranges of the segments starting within a
+        range of frames.
+        """
+        if stop is None:
+            stop = self.n_frames
+        first = -(-start // self.segment_length) * self.segment_length
+        return [(i, min(i + self.segment_length, self.n_frames))
+                for i in range(first, min(stop, self.n_frames),
+                               self.segment_length)]
+
+    def completed(self):
+        """The (start, stop) frame ranges of the completed segments"""
+        state = self._read()
+        return [tuple(segment) for segment in state['completed']
+                if os.path.exists(self.path(segment[0]))]
+
+    def missing(self):
+        """The (start, stop) frame ranges of the segments still to do"""
+        completed = set(self.completed())
+        return [segment for segment in self.segments()
+                if segment not in completed]
+
+    def claim(self, segment):
+        """
+        Claim a segment for this process to save, unless it is completed or
+        another live process has claimed it. A claim is renewed in the
+        background until the segment is completed or released.
+
+        :return: bool
+            Whether the segment was claimed.
+        """
+        with self._lock():
+            state = self._read()
+            claimed = state.setdefault('claimed', {})
+            claim = claimed.get(str(segment[0]))
+            if list(segment) in state['completed'] or (
+                    claim is not None and self._alive(claim)):
+                return False
+            claimed[str(segment[0])] = dict(self.owner, time=time.time())
+            self._write(state)
+        renewal = _Renewal(self, segment)
+        self._renewals[segment[0]] = renewal
+        renewal.start()
+        return True
+
+    def release(self, segment):
+        """Give up this process's claim on a segment"""
+        self._stop_renewal(segment)
+        with self._lock():
+            state = self._read()
+            claimed = state.setdefault('claimed', {})
+            claim = claimed.get(str(segment[0]))
+            if claim is not None and self._owns(claim):
+                del claimed[str(segment[0])]
+                self._write(state)
+
+    def complete(self, segment):
+        """Record a segment as completed, and release its claim"""
+        self._stop_renewal(segment)
+        with self._lock():
+            state = self._read()
+            if list(segment) not in state['completed']:
+                state['completed'].append(list(segment))
+                state['completed'].sort()
+            state.setdefault('claimed', {}).pop(str(segment[0]), None)
+            self._write(state)
+
+    def path(self, start):
+        """The path of the segment starting at a frame"""
+        return os.path.join(self.directory,
+                            f'segment_{start:08d}{self.extension}')
+
+    def join(self, filename, extra_args=None):
+        """
+        Join the segments into one file, without re-encoding them.
+        This uses ffmpeg's concat demuxer, so the segments must be in a
+        format that it can copy, such as mp4 or mkv.
+
+        :param filename: str
+            The file to create.
+        :param extra_args: list of str, optional
+            Extra arguments for ffmpeg.
+        """
+        missing = self.missing()
+        if missing:
+            raise ValueError(f"Cannot join an incomplete export; the frames "
+                             f"{missing} are still to be saved")
+
+        listing = os.path.join(self.directory, 'segments.txt')
+        with open(listing, 'w') as f:
+            for start, _ in self.segments():
+                path = os.path.abspath(self.path(start)).replace("'", r"'\''")
+                f.write(f"file '{path}'\n")
+
+        command = [mpl.rcParams['animation.ffmpeg_path'], '-y',
+                   '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                   '-i', listing, '-c', 'copy']
+        command += list(extra_args or []) + [filename]
+        subprocess.run(command, check=True)
+
+    def _renew(self, segment):
+        # returns False once the claim is no longer held
+        with self._lock():
+            state = self._read()
+            claim = state.setdefault('claimed', {}).get(str(segment[0]))
+            if claim is None or not self._owns(claim):
+                return False
+            claim['time'] = time.time()
+            self._write(state)
+            return True
+
+    def _stop_renewal(self, segment):
+        renewal = self._renewals.pop(segment[0], None)
+        if renewal is not None:
+            renewal.stopped.set()
+
+    def _owns(self, claim):
+        return (claim['host'], claim['pid']) == (self.owner['host'],
+                                                 self.owner['pid'])
+
+    def _alive(self, claim):
+        if time.time() - claim['time'] > self.stale_claim:
+            return False
+        if claim['host'] != self.owner['host']:
+            return True
+        # a process on this machine can be checked directly
+        try:
+            os.kill(claim['pid'], 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _read(self):
+        try:
+            with open(os.path.join(self.directory, self.filename)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write(self, state):
+        path = os.path.join(self.directory, self.filename)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def _lock(self):
+        return _FileLock(os.path.join(self.directory, 'manifest.lock'),
+                         self.stale_lock)
+
+
+class _FileLock:
+    def __init__(self, path, stale):
+        self.path = path
+        self.stale = stale
+
+    def __enter__(self):
+        while True:
+            try:
+                os.close(os.open(self.path,
+                                 os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale:
+                        os.remove(self.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        os.remove(self.path)
+
+
+class _Renewal(threading.Thread):
+    def __init__(self, manifest, segment):
+        super().__init__(daemon=True)
+        self.manifest = manifest
+        self.segment = segment
+        # set when the claim is completed or released
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.manifest.stale_claim / 3):
+            if not self.manifest._renew(self.segment):
+                return
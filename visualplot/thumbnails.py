@@ -0,0 +1,289 @@
+import multiprocessing
+import os
+import sys
+import threading
+from io import BytesIO
+
+import matplotlib as mpl
+import numpy as np
+
+# the job shared with forked worker processes
+_job = None
+_NON_INTERACTIVE = {'agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template'}
+
+
+def render_frames(visualization, frames, size=None, dpi=None, workers=None,
+                  directory=None, format='png'):
+    """
+    Render any set of frames of a visualization, without playing it.
+    Each frame is drawn by jumping straight to it, so rendering a few frames
+    of a long animation is cheap. Frames are rendered offscreen in parallel
+    processes where that is safe, and one at a time otherwise. Processes
+    are only used on Linux, with a non-interactive backend, and when no
+    other threads are running (such as the prefetching of a FrameStore).
+    The visualization is left showing the frame it was on.
+
+    :param visualization: visualplot.visualization.Visualization
+    :param frames: sequence of int
+        The frame numbers to render.
+    :param size: (float, float), optional
+        The figure size in inches to render at, as for ``figsize``.
+        Defaults to the figure's size.
+    :param dpi: float, optional
+        The resolution to render at. Defaults to the figure's dpi.
+    :param workers: int, optional
+        The number of processes to use. Defaults to the number of CPUs.
+    :param directory: str, optional
+        If given, the frames are written to this directory as
+        ``frame_<number>.<format>`` rather than returned as arrays.
+    :param format: str, optional
+        The image format to write, e.g. 'png' or 'webp'. Defaults to 'png'.
+    :return: list
+        An RGBA numpy array of shape (height, width, 4) for each frame, or
+        the path of each file written if a directory is given.
+    """
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+    return list(_iter_frames(visualization, frames, size, dpi, workers,
+                             directory, format))
+
+
+def frame_changes(visualization, workers=None):
+    """
+    Measure how much each frame of a visualization differs from the one
+    before.
+    The change is worked out from the data of each block, without drawing
+    anything. Each input of a block is scaled so that its largest change is
+    1, and the changes of all inputs are summed. If a block cannot describe
+    its frames (such as ``Update``), the whole visualization is instead
+    compared by the pixels of small renders.
+
+    :param visualization: visualplot.visualization.Visualization
+    :param workers: int, optional
+        The number of processes to render with, if frames have to be
+        rendered. Defaults to the number of CPUs.
+    :return: numpy array of floats, of shape (T,)
+        The change into each frame. The first frame has no change.
+    """
+    length = visualization.timeline._len
+    changes = np.zeros(length)
+    if not length:
+        return changes
+
+    blocks = visualization.blocks
+    previous = [_block_frame(block, 0) for block in blocks]
+    if any(data is None for data in previous):
+        return _pixel_changes(visualization, workers)
+
+    columns = {}
+    for i in range(1, length):
+        current = [_block_frame(block, i) for block in blocks]
+        for b, (before, after) in enumerate(zip(previous, current)):
+            before, after = _leaves(before), _leaves(after)
+            if len(before) != len(after):
+                # a different number of inputs counts as the largest change
+                columns.setdefault((b, None), np.zeros(length))[i] = np.inf
+                continue
+            for k, (x, y) in enumerate(zip(before, after)):
+                change = _leaf_change(x, y)
+                if change:
+                    columns.setdefault((b, k), np.zeros(length))[i] = change
+        previous = current
+
+    for column in columns.values():
+        finite = column[np.isfinite(column)]
+        scale = finite.max() if finite.size and finite.max() > 0 else 1.
+        column[np.isposinf(column)] = scale
+        changes += column / scale
+    return changes
+
+
+def select_keyframes(changes, n):
+    """
+    Choose ``n`` frames that summarise an animation.
+    Keyframes are spread evenly over a blend of time and change, half of
+    each, so that the whole animation is covered, but more keyframes fall
+    where more happens, just after large changes. Keyframes are kept at
+    least ``T / 2n`` frames apart, so one large change cannot take several.
+
+    :param changes: numpy array of shape (T,)
+        The change into each frame, see :func:`frame_changes`.
+    :param n: int
+        The number of keyframes.
+    :return: list of int
+        The frame numbers of the keyframes, in order.
+    """
+    changes = np.nan_to_num(np.asarray(changes, dtype=float))
+    length = len(changes)
+    n = min(n, length)
+    if n <= 0:
+        return []
+
+    total = changes.sum()
+    weights = np.full(length, 1. / length)
+    if total > 0:
+        weights = 0.5 * changes / total + 0.5 * weights
+    targets = (np.arange(n) + 0.5) / n
+    candidates = np.searchsorted(np.cumsum(weights), targets)
+
+    spacing = max(length // (2 * n), 1)
+    chosen = []
+    for i in np.minimum(candidates, length - 1).tolist():
+        if all(abs(i - j) >= spacing for j in chosen):
+            chosen.append(i)
+
+    # fill in any keyframes that were too close with the frames furthest
+    # from those already chosen
+    frames = np.arange(length)
+    while len(chosen) < n:
+        distance = np.min(np.abs(frames[:, None] - np.array(chosen)[None]),
+                          axis=1)
+        chosen.append(int(np.argmax(distance)))
+    return sorted(chosen)
+
+
+def _iter_frames(visualization, frames, size, dpi, workers, directory,
+                 format):
+    global _job
+
+    frames = [int(i) for i in frames]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(frames))
+    job = (visualization, size, dpi, directory, format)
+
+    if workers <= 1 or not _can_fork(visualization):
+        fig = visualization.fig
+        timeline = visualization.timeline
+        current = timeline.index % max(timeline._len, 1)
+        original_size = fig.get_size_inches().copy()
+        try:
+            if size is not None:
+                fig.set_size_inches(size)
+            for i in frames:
+                yield _render(job, i)
+        finally:
+            fig.set_size_inches(original_size)
+            if frames:
+                visualization._draw_frame(current)
+        return
+
+    # forked workers inherit the visualization, so nothing but the frame
+    # numbers and the results are sent between processes
+    _job = job
+    try:
+        context = multiprocessing.get_context('fork')
+        chunksize = max(1, len(frames) // (4 * workers))
+        with context.Pool(workers, initializer=_init_worker) as pool:
+            yield from pool.imap(_render_frame, frames, chunksize)
+    finally:
+        _job = None
+
+
+def _can_fork(visualization):
+    # a forked child only gets the thread that forked it, so locks held
+    # by other threads, or by a GUI event loop, are never released
+    canvas = visualization.fig.canvas
+    return (sys.platform.startswith('linux')
+            and threading.active_count() == 1
+            and mpl.get_backend().lower() in _NON_INTERACTIVE
+            and canvas.required_interactive_framework is None)
+
+
+def _init_worker():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    visualization, size, _, _, _ = _job
+    # draw offscreen, whatever backend the figure was made with
+    FigureCanvasAgg(visualization.fig)
+    if size is not None:
+        visualization.fig.set_size_inches(size)
+
+
+def _render_frame(i):
+    return _render(_job, i)
+
+
+def _render(job, i):
+    visualization, _, dpi, directory, format = job
+    fig = visualization.fig
+    if dpi is None:
+        dpi = fig.dpi
+
+    visualization._draw_frame(i)
+    buf = BytesIO()
+    fig.savefig(buf, format='rgba', dpi=dpi)
+    width = int(fig.get_size_inches()[0] * dpi)
+    frame = np.frombuffer(buf.getbuffer(), dtype=np.uint8)
+    frame = frame.reshape(-1, width, 4)
+    if directory is None:
+        return frame
+
+    from PIL import Image
+
+    im = Image.fromarray(frame, 'RGBA')
+    # Pillow names formats by their main extension, e.g. 'jpg' is 'JPEG'
+    pil_format = Image.registered_extensions().get(f'.{format.lower()}',
+                                                   format)
+    if pil_format == 'JPEG':
+        im = im.convert('RGB')
+    path = os.path.join(directory, f'frame_{i:08d}.{format}')
+    im.save(path, format=pil_format)
+    return path
+
+
+def _pixel_changes(visualization, workers):
+    length = visualization.timeline._len
+    changes = np.zeros(length)
+    previous = None
+    # small renders are enough to tell how much changed
+    for i, frame in enumerate(_iter_frames(visualization, range(length),
+                                           None, 10, workers, None, None)):
+        frame = frame.astype(np.int16)
+        if previous is not None:
+            changes[i] = np.abs(frame - previous).mean()
+        previous = frame
+    return changes
+
+
+def _block_frame(block, i):
+    data = block._frame_data(i)
+    if data is None:
+        return None
+    return data, block._frame_limits(i)
+
+
+def _leaves(data):
+    if isinstance(data, (list, tuple)):
+        return [leaf for item in data for leaf in _leaves(item)]
+    if isinstance(data, dict):
+        return [leaf for key in sorted(data, key=repr)
+                for leaf in _leaves(data[key])]
+    return [data]
+
+
+def _leaf_change(before, after):
+    if before is after:
+        return 0.
+    if isinstance(before, (np.ndarray, int, float, np.number)):
+        before, after = np.asarray(before), np.asarray(after)
+        if (before.shape == after.shape and before.dtype.kind in 'biuf'
+                and after.dtype.kind in 'biuf'):
+            if not before.size:
+                return 0.
+            with np.errstate(invalid='ignore'):
+                difference = np.atleast_1d(np.abs(after.astype(float)
+                                                  - before))
+            # a value appearing or vanishing counts as a change
+            difference[np.isnan(before) != np.isnan(after)] = np.inf
+            difference = difference[~np.isnan(difference)]
+            if not difference.size:
+                return 0.
+            if np.isinf(difference).any():
+                return np.inf
+            return float(difference.mean())
+        return 0. if np.array_equal(before, after) else np.inf
+    try:
+        return 0. if bool(before == after) else np.inf
+    except (TypeError, ValueError):
+        return np.inf
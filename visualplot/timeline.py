@@ -9,7 +9,11 @@ class Timeline:
     def __init__(self, t, units='', fps=10, log=False):
         """
         :param t: array_like
-            Gets converted into a numpy array representing the time at each frame of the animation.
+            The time at each frame of the animation. Arrays (including
+            memory-mapped arrays) and ranges are used as they are, and
+            multi-dimensional arrays from a meshgrid are reduced to the
+            time axis without reading the whole array. Other sequences are
+            converted into a numpy array.
         :param units:  str, optional
             The units in which the time is measured.
         :param fps: float, optional
@@ -17,35 +21,98 @@ class Timeline:
         :param log: bool, optional
             Displays the time scale logarithmically (base 10). Defaults to False.
         """
-        t = np.asanyarray(t)
-        if len(t.shape) > 1:
-            self.t = demeshgrid(t)
-            if self.t is None:
-                raise ValueError("Unable to interpret time values. Please try passing a 1D array instead.")
-        else:
-            self.t = t
+        if isinstance(t, range):
+            t = _TimeRange(t.start, t.step, len(t))
+        elif not isinstance(t, _TimeRange):
+            t = np.asanyarray(t)
+            if len(t.shape) > 1:
+                t = demeshgrid(t)
+                if t is None:
+                    raise ValueError("Unable to interpret time values. Please try passing a 1D array instead.")
+        self._t = t
+        self._values = None
 
         self.fps = fps
         self.units = units
         self.log = log
-
-        if self.log:
-            self.t = np.log10(self.t)
         self.index = 0
 
-        self._len = len(self.t)
+        self._len = len(self._t)
+
+    @classmethod
+    def from_steps(cls, start, step, count, units='', fps=10, log=False):
+        """
+        Create a timeline of evenly spaced times, without storing them.
+
+        :param start: scalar or numpy.datetime64
+            The time of the first frame.
+        :param step: scalar or numpy.timedelta64
+            The time between frames.
+        :param count: int
+            The number of frames.
+
+        See :class:`Timeline` for the other parameters.
+        """
+        return cls(_TimeRange(start, step, count), units, fps, log)
+
+    @property
+    def t(self):
+        """The time of every frame, as a numpy array"""
+        if self._values is None:
+            values = np.asarray(self._t)
+            self._values = np.log10(values) if self.log else values
+        return self._values
+
+    @property
+    def dtype(self):
+        """The data type of the time values"""
+        if self.log:
+            return np.dtype(float)
+        return self._t.dtype
 
     def __getitem__(self, item):
-        return self.t.__getitem__(item)
+        value = self._t[item]
+        if self.log:
+            return np.log10(value)
+        return value
 
     def __repr__(self):
-        time = repr(self.t)
+        time = repr(self._t)
         units = repr(self.units)
         return f"visualplot.visualization.Timeline(t={time}, units={units}, fps={self.fps}"
 
     def __len__(self):
-        return self.__len__()
+        return self._len
 
     def _update(self):
         """ increment the current timeline"""
         self.index = (self.index + 1) % self._len
+
+
+class _TimeRange:
+    """Evenly spaced time values, computed when they are indexed"""
+
+    def __init__(self, start, step, count):
+        self.start = start
+        self.step = step
+        self.count = count
+        self.dtype = np.asarray(start + step * 0).dtype
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.start + self.step * np.arange(self.count)[item]
+        if item < 0:
+            item += self.count
+        if not 0 <= item < self.count:
+            raise IndexError("time index out of range")
+        return self.start + self.step * item
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.start + self.step * np.arange(self.count)
+        return values if dtype is None else values.astype(dtype)
+
+    def __repr__(self):
+        return f"range(start={self.start!r}, step={self.step!r}, count={self.count})"
@@ -1,7 +1,22 @@
+import os
+
+import matplotlib as mpl
 import numpy as np
+from matplotlib import animation
 from matplotlib.animation import FuncAnimation, PillowWriter
+from matplotlib.axis import Axis
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib.text import Text
 from matplotlib.widgets import Button, Slider
 
+from visualplot.cache import _CachedFigure
+from visualplot.htmlexport import render_html
+from visualplot.segments import Manifest
+from visualplot.thumbnails import (frame_changes, render_frames,
+                                   select_keyframes)
 from visualplot.timeline import Timeline
 import matplotlib.pyplot as plt
 
@@ -12,7 +27,7 @@ class Visualization:
         a matplotlib animation returned from FuncAnimation
     """
 
-    def __int__(self, blocks, timeline=None, fig=None):
+    def __init__(self, blocks, timeline=None, fig=None):
         if timeline is None:
             self.timeline = Timeline(range(len(blocks[0])))
         elif not isinstance(timeline, Timeline):
@@ -20,7 +35,7 @@ class Visualization:
         else:
             self.timeline = timeline
 
-        _len_time = len(timeline)
+        _len_time = len(self.timeline)
         for block in blocks:
             if len(block) != _len_time:
                 raise ValueError("All blocks must animate for the same amount of time")
@@ -69,7 +84,7 @@ class Visualization:
             horizontalalignment='center',
             transform=self.button_ax.transAxes
         )
-        self.button.label2.set_visable(False)
+        self.button.label2.set_visible(False)
 
         def pause(event):
             if self._pause:
@@ -96,13 +111,196 @@ class Visualization:
         self.timeline.index -= 1  # required for proper starting point for save
         self.animation.save(filename + '.gif', writer=PillowWriter(fps=self.timeline.fps))
 
-    def save(self, *args, **kwargs):
+    def save(self, filename, writer=None, fps=None, dpi=None, codec=None,
+             bitrate=None, extra_args=None, metadata=None, extra_anim=None,
+             savefig_kwargs=None, *, progress_callback=None, cache=None):
         """
         Save an animation
-                A wrapper around :meth:`matplotlib.animation.Animation.save`
+                A wrapper around :meth:`matplotlib.animation.Animation.save`,
+                taking the same arguments.
+
+        :param cache: visualplot.cache.RenderCache, optional
+            If given, frames whose inputs are unchanged since they were last
+            saved are taken from the cache instead of being drawn again.
+            A frame's inputs are the data of every block at that frame, the
+            keyword arguments the blocks were created with, the figure and
+            axes layout, the rcParams, and the output settings. Frames of
+            blocks that cannot describe their inputs (such as ``Update``)
+            are always drawn. Cannot be used with ``extra_anim``.
         """
+        kwargs = {'writer': writer, 'fps': fps, 'dpi': dpi, 'codec': codec,
+                  'bitrate': bitrate, 'extra_args': extra_args,
+                  'metadata': metadata, 'savefig_kwargs': savefig_kwargs,
+                  'progress_callback': progress_callback}
+        if cache is not None:
+            if extra_anim:
+                raise ValueError("extra_anim cannot be saved with a cache")
+            self._write_frames(filename, range(self.timeline._len),
+                               cache=cache, **kwargs)
+            return
         self.timeline.index = -1  # required for proper starting point for save
-        self.animation.save(*args, **kwargs)
+        self.animation.save(filename, extra_anim=extra_anim, **kwargs)
+
+    def save_segments(self, directory, segment_length=500, frames=None,
+                      writer='ffmpeg', extension='.mp4', cache=None,
+                      **kwargs):
+        """
+        Save an animation as a series of segments that can be resumed.
+        Each segment is written to its own file in the directory, and
+        recorded in a manifest once it is complete. Calling this again with
+        the same directory only saves the segments that are missing, so an
+        export that was interrupted carries on from the last completed
+        segment. Several processes or machines sharing the directory can
+        save the animation together; each segment is claimed by the
+        process saving it, and skipped by the others.
+        Join the segments with :meth:`join_segments` once all are saved.
+
+        :param directory: str
+            The directory to save the segments and manifest in.
+        :param segment_length: int, optional
+            The number of frames in each segment. Defaults to 500.
+        :param frames: (int, int), optional
+            Only save the segments starting within this range of frames,
+            e.g. to split an export between machines. Defaults to all.
+        :param writer: str or matplotlib.animation.AbstractMovieWriter, optional
+            The writer to save each segment with. Defaults to 'ffmpeg'. A
+            writer instance is set up once for each segment.
+        :param extension: str, optional
+            The file extension of the segments. Defaults to '.mp4'.
+        :param cache: visualplot.cache.RenderCache, optional
+            Take unchanged frames from a cache, as for :meth:`save`.
+
+        All other keyword arguments (``fps``, ``dpi``, ``codec``,
+        ``bitrate``, ``extra_args``, ``metadata``, ``savefig_kwargs`` and
+        ``progress_callback``) are as for
+        :meth:`matplotlib.animation.Animation.save`. Progress is reported
+        for each segment.
+        """
+        manifest = Manifest(directory, self.timeline._len, segment_length,
+                            extension)
+        if frames is None:
+            frames = (0, self.timeline._len)
+        completed = set(manifest.completed())
+
+        for start, stop in manifest.segments(*frames):
+            if (start, stop) in completed or not manifest.claim((start, stop)):
+                continue
+            path = manifest.path(start)
+            # only a finished segment gets its final name
+            root, ext = os.path.splitext(path)
+            partial = f'{root}.partial{ext}'
+            try:
+                self._write_frames(partial, range(start, stop),
+                                   writer=writer, cache=cache, **kwargs)
+                os.replace(partial, path)
+            except BaseException:
+                manifest.release((start, stop))
+                raise
+            manifest.complete((start, stop))
+
+    def join_segments(self, directory, filename, extra_args=None):
+        """
+        Join the segments saved by :meth:`save_segments` into one file.
+        The segments are copied, not re-encoded, using ffmpeg.
+
+        :param directory: str
+            The directory the segments were saved in.
+        :param filename: str
+            The file to create.
+        :param extra_args: list of str, optional
+            Extra arguments for ffmpeg.
+        """
+        Manifest.load(directory).join(filename, extra_args)
+
+    def _write_frames(self, filename, frames, writer=None, fps=None,
+                      dpi=None, codec=None, bitrate=None, extra_args=None,
+                      metadata=None, savefig_kwargs=None,
+                      progress_callback=None, cache=None):
+        if writer is None:
+            writer = mpl.rcParams['animation.writer']
+        if fps is None:
+            fps = self.timeline.fps
+        if isinstance(writer, str):
+            writer_kwargs = {'codec': codec, 'bitrate': bitrate,
+                             'extra_args': extra_args, 'metadata': metadata}
+            writer_kwargs = {key: value for key, value in writer_kwargs.items()
+                             if value is not None}
+            writer = animation.writers[writer](fps=fps, **writer_kwargs)
+        if savefig_kwargs is None:
+            savefig_kwargs = {}
+        if progress_callback is None:
+            def progress_callback(current, total):
+                pass
+
+        if cache is None:
+            with writer.saving(self.fig, filename, dpi):
+                for n, i in enumerate(frames):
+                    self._draw_frame(i)
+                    progress_callback(n, len(frames))
+                    writer.grab_frame(**savefig_kwargs)
+            return
+
+        # blocks change the figure as they draw, so take its state at the
+        # same frame every time
+        self._draw_frame(0)
+        figure_state = self._figure_state()
+
+        fig = _CachedFigure(self.fig, cache, self._draw_frame)
+        with writer.saving(fig, filename, dpi):
+            output = (type(writer).__name__, writer.fps, writer.dpi,
+                      getattr(writer, 'frame_format', None),
+                      writer.frame_size, savefig_kwargs)
+            for n, i in enumerate(frames):
+                fig.frame = i
+                fig.key = self._frame_key(i, cache, output, figure_state)
+                progress_callback(n, len(frames))
+                writer.grab_frame(**savefig_kwargs)
+
+    def _draw_frame(self, i):
+        for block in self.blocks:
+            block._update(i)
+        if self._has_slider:
+            # the slider's callback would update the blocks again, and both
+            # it and the slider would draw the canvas
+            self.slider.eventson = self.slider.drawon = False
+            try:
+                self.slider.set_val(i)
+            finally:
+                self.slider.eventson = self.slider.drawon = True
+            self.slider.valtext.set_text(self.slider.valfmt % self.timeline[i])
+
+    def _figure_state(self):
+        axes = []
+        for ax in self.fig.axes:
+            axes.append((ax.get_position().bounds, ax.get_xlim(),
+                         ax.get_ylim(), ax.get_xscale(), ax.get_yscale(),
+                         ax.get_xlabel(), ax.get_ylabel(),
+                         [_axis_state(axis) for axis in
+                          (ax.xaxis, ax.yaxis)]))
+        # everything drawn, including titles, legends, colorbars and the
+        # color limits of images
+        artists = [_artist_state(artist) for artist in _walk(self.fig)]
+        return (mpl.__version__, tuple(self.fig.get_size_inches()),
+                self.fig.dpi, self.fig.get_facecolor(), dict(mpl.rcParams),
+                axes, artists)
+
+    def _frame_key(self, i, cache, output, figure_state):
+        blocks = []
+        for block in self.blocks:
+            data = block._frame_data(i)
+            if data is None:
+                return None
+            # autoscaled limits depend on other frames than this one
+            blocks.append((type(block).__name__,
+                           getattr(block, '_kwargs', None), data,
+                           block._frame_limits(i)))
+        # the slider text is part of the frame
+        time = self.timeline[i] if self._has_slider else None
+        try:
+            return cache.key(output, figure_state, blocks, time)
+        except TypeError:
+            # inputs that cannot be hashed reliably are always drawn
+            return None
 
     def timeline_slider(self, text='Time', ax=None, valfmt=None, color=None):
         """
@@ -127,13 +325,7 @@ class Visualization:
         else:
             self.slider_ax = ax
 
-        if valfmt is None:
-            if (np.issubdtype(self.timeline.t.dtype, np.datetime64)
-                    or np.issubdtype(self.timeline.t.dtype, np.timedelta64)):
-                valfmt = '%s'
-            else:
-                valfmt = '%1.2f'
-
+        valfmt = self._time_format(valfmt)
         if self.timeline.log:
             valfmt = f'$10^{valfmt}$'
 
@@ -143,6 +335,8 @@ class Visualization:
             valfmt=(valfmt + self.timeline.units),
             valstep=1, color=color
         )
+        # the slider shows its value, the frame number, until it is moved
+        self.slider.valtext.set_text(self.slider.valfmt % self.timeline[0])
         self._has_slider = True
 
         def set_time(t):
@@ -155,3 +349,146 @@ class Visualization:
                 self.fig.canvas.draw()
 
         self.slider.on_changed(set_time)
+
+    def _time_format(self, valfmt=None):
+        if valfmt is None:
+            if (np.issubdtype(self.timeline.dtype, np.datetime64)
+                    or np.issubdtype(self.timeline.dtype, np.timedelta64)):
+                valfmt = '%s'
+            else:
+                valfmt = '%1.2f'
+        return valfmt
+
+    def to_html(self, filename=None, chunksize=50, dpi=None, text='Time',
+                valfmt=None, level=6):
+        """
+        Export the animation as a self-contained HTML player, with play/pause
+        and timeline controls.
+        Frames are stored as compressed chunks of frame differences, and the
+        browser unpacks them a frame at a time as they play, so long
+        animations stay small and quick to load. See
+        :func:`visualplot.htmlexport.render_html`.
+
+        :param filename: str, optional
+            The file to write the player to.
+        :param chunksize: int, optional
+            The number of frames in each chunk. Defaults to 50.
+        :param dpi: float, optional
+            The resolution to render frames at. Defaults to the figure's dpi.
+        :param text: str, optional
+            The text to display for the slider. Defaults to 'Time'
+        :param valfmt: str, optional
+            a format specifier used to print the time
+        :param level: int, optional
+            The zlib compression level. Defaults to 6.
+        :return: str
+            The HTML of the player.
+        """
+        html = render_html(self, chunksize, dpi, text, valfmt, level)
+        if filename is not None:
+            with open(filename, 'w') as f:
+                f.write(html)
+        return html
+
+    def render_frames(self, frames=None, keyframes=None, size=None, dpi=None,
+                      workers=None, directory=None, format='png'):
+        """
+        Render chosen frames as images, e.g. for posters or thumbnails.
+        Each frame is drawn by jumping straight to it, offscreen and in
+        parallel processes. See :func:`visualplot.thumbnails.render_frames`.
+
+        :param frames: sequence of int, optional
+            The frame numbers to render. Defaults to every frame.
+        :param keyframes: int, optional
+            Render this many keyframes, chosen with :meth:`keyframes`,
+            instead of the given frames.
+        :param size: (float, float), optional
+            The figure size in inches to render at, as for ``figsize``.
+            Defaults to the figure's size.
+        :param dpi: float, optional
+            The resolution to render at. Defaults to the figure's dpi.
+        :param workers: int, optional
+            The number of processes to use. Defaults to the number of CPUs.
+        :param directory: str, optional
+            If given, the frames are written to this directory as
+            ``frame_<number>.<format>`` rather than returned as arrays.
+        :param format: str, optional
+            The image format to write, e.g. 'png' or 'webp'.
+            Defaults to 'png'.
+        :return: list
+            An RGBA numpy array of shape (height, width, 4) for each frame,
+            or the path of each file written if a directory is given.
+        """
+        if frames is not None and keyframes is not None:
+            raise ValueError("Only one of frames and keyframes can be given")
+        if keyframes is not None:
+            frames = self.keyframes(keyframes, workers=workers)
+        elif frames is None:
+            frames = range(self.timeline._len)
+        return render_frames(self, frames, size, dpi, workers, directory,
+                             format)
+
+    def keyframes(self, n, workers=None):
+        """
+        Choose the frames that best summarise the animation.
+        Keyframes are spread evenly over how much the animation changes
+        rather than over time, so they cluster where the most happens.
+        See :func:`visualplot.thumbnails.frame_changes`.
+
+        :param n: int
+            The number of keyframes. A single keyframe makes a poster frame.
+        :param workers: int, optional
+            The number of processes to use, if frames have to be rendered
+            to compare them. Defaults to the number of CPUs.
+        :return: list of int
+            The frame numbers of the keyframes, in order.
+        """
+        return select_keyframes(frame_changes(self, workers), n)
+
+
+def _walk(artist):
+    yield artist
+    # tick labels are only laid out when drawn, so the axis is described by
+    # its locator and formatter instead
+    if isinstance(artist, Axis):
+        return
+    for child in artist.get_children():
+        yield from _walk(child)
+
+
+def _artist_state(artist):
+    state = [type(artist).__name__, artist.get_visible(), artist.get_alpha(),
+             artist.get_zorder()]
+    if isinstance(artist, Text):
+        state += [artist.get_text(), artist.get_position(),
+                  artist.get_color(), artist.get_fontsize(),
+                  artist.get_fontfamily(), artist.get_fontweight(),
+                  artist.get_fontstyle(), artist.get_rotation(),
+                  artist.get_horizontalalignment(),
+                  artist.get_verticalalignment()]
+    if isinstance(artist, ScalarMappable):
+        state += [artist.get_clim(), artist.get_cmap().name,
+                  type(artist.norm).__name__]
+    if isinstance(artist, Line2D):
+        state += [artist.get_color(), artist.get_linestyle(),
+                  artist.get_linewidth(), artist.get_marker(),
+                  artist.get_markersize()]
+    if isinstance(artist, Patch):
+        state += [artist.get_facecolor(), artist.get_edgecolor(),
+                  artist.get_linewidth()]
+    if isinstance(artist, Collection):
+        state += [artist.get_edgecolor(), artist.get_linewidth()]
+        # mapped colors come from the data
+        if artist.get_array() is None:
+            state.append(artist.get_facecolor())
+    return state
+
+
+def _axis_state(axis):
+    state = []
+    for ticker in (axis.get_major_locator(), axis.get_major_formatter(),
+                   axis.get_minor_locator(), axis.get_minor_formatter()):
+        func = getattr(ticker, 'func', None)
+        state.append((type(ticker).__name__, getattr(ticker, 'fmt', None),
+                      getattr(func, '__qualname__', None)))
+    return state